@@ -0,0 +1,233 @@
+"""
+A local stand-in for a Stremio add-on such as Cinemeta.
+
+Serves the ``manifest``, ``catalog`` and ``meta`` routes of the add-on
+protocol from synthesized metas (see ``benchmarks.fixtures``), with knobs for
+payload size, latency, errors, throttling and HTTP validators. Run it on its
+own from the repository root:
+
+    python -m benchmarks.fake_addon --port 11470 --latency 0.2 --error-rate 0.05
+
+Catalogs are then served at ``http://127.0.0.1:11470/catalog/movie/top.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.stremio.const import CATALOG_PAGE_SIZE
+
+from .fixtures import GENRES, MEDIA_TYPES, build_meta
+
+
+@dataclass
+class FakeAddonOptions:
+    """Behaviour of the fake add-on."""
+
+    # Metas in each unfiltered catalog
+    items: int = 1000
+    page_size: int = CATALOG_PAGE_SIZE
+    # Seconds added to every response
+    latency: float = 0.0
+    # Share of requests answered with 503 and with 429
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    etag: bool = True
+    # Cache-Control max-age of catalog responses, None to send no header
+    max_age: int | None = None
+    seed: int = 0
+
+
+@dataclass
+class FakeAddonStats:
+    """Counters of the requests served."""
+
+    requests: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    throttled: int = 0
+    bytes_sent: int = 0
+    by_route: dict[str, int] = field(default_factory=dict)
+
+
+class FakeAddon:
+    """An aiohttp application serving a fake Stremio add-on."""
+
+    def __init__(self, options: FakeAddonOptions | None = None) -> None:
+        """Initialize the add-on and synthesize its catalogs."""
+        self.options = options or FakeAddonOptions()
+        self.stats = FakeAddonStats()
+        self._rng = random.Random(self.options.seed)  # noqa: S311
+        self._metas = {
+            media_type: [
+                build_meta(media_type, i, random.Random(f"{media_type}-{i}"))  # noqa: S311
+                for i in range(self.options.items)
+            ]
+            for media_type in MEDIA_TYPES
+        }
+        self._by_id = {
+            (media_type, meta["id"]): meta
+            for media_type, metas in self._metas.items()
+            for meta in metas
+        }
+        self._bodies: dict[str, tuple[bytes, str]] = {}
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/manifest.json", self._manifest)
+        app.router.add_get("/catalog/{type}/{id}.json", self._catalog)
+        app.router.add_get("/catalog/{type}/{id}/{extra}.json", self._catalog)
+        app.router.add_get("/meta/{type}/{id}.json", self._meta)
+        return app
+
+    async def _respond(
+        self, request: web.Request, route: str, key: str, build: Any
+    ) -> web.Response:
+        """Apply latency, errors and validators, then answer with a JSON body."""
+        stats = self.stats
+        stats.requests += 1
+        stats.by_route[route] = stats.by_route.get(route, 0) + 1
+
+        if self.options.latency:
+            await asyncio.sleep(self.options.latency)
+
+        if self._rng.random() < self.options.throttle_rate:
+            stats.throttled += 1
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        if self._rng.random() < self.options.error_rate:
+            stats.errors += 1
+            return web.Response(status=503)
+
+        if (cached := self._bodies.get(key)) is None:
+            body = json.dumps(build()).encode()
+            cached = self._bodies[key] = (body, hashlib.sha1(body).hexdigest())  # noqa: S324
+        body, digest = cached
+
+        headers = {}
+        if self.options.max_age is not None:
+            headers["Cache-Control"] = f"max-age={self.options.max_age}"
+        if self.options.etag:
+            headers["ETag"] = f'"{digest}"'
+            if request.headers.get("If-None-Match") == headers["ETag"]:
+                stats.not_modified += 1
+                return web.Response(status=304, headers=headers)
+
+        stats.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    async def _manifest(self, request: web.Request) -> web.Response:
+        """Serve the add-on manifest."""
+        return await self._respond(
+            request,
+            "manifest",
+            "manifest",
+            lambda: {
+                "id": "org.stremio.fake",
+                "version": "1.0.0",
+                "name": "Fake Cinemeta",
+                "resources": ["catalog", "meta"],
+                "types": list(MEDIA_TYPES),
+                "catalogs": [
+                    {
+                        "type": media_type,
+                        "id": "top",
+                        "name": "Popular",
+                        "genres": GENRES,
+                        "extra": [{"name": "genre"}, {"name": "skip"}],
+                    }
+                    for media_type in MEDIA_TYPES
+                ],
+            },
+        )
+
+    async def _catalog(self, request: web.Request) -> web.Response:
+        """Serve a catalog page, filtered by genre and paged with skip."""
+        media_type = request.match_info["type"]
+        extra = dict(
+            part.split("=", 1)
+            for part in request.match_info.get("extra", "").split("&")
+            if "=" in part
+        )
+        genre = extra.get("genre")
+        skip = int(extra.get("skip", 0))
+
+        def build() -> dict[str, Any]:
+            metas = self._metas.get(media_type, [])
+            if genre:
+                metas = [meta for meta in metas if genre in meta["genre"]]
+            return {"metas": metas[skip : skip + self.options.page_size]}
+
+        return await self._respond(
+            request, "catalog", f"catalog/{media_type}/{genre}/{skip}", build
+        )
+
+    async def _meta(self, request: web.Request) -> web.Response:
+        """Serve the full meta of a title."""
+        media_type = request.match_info["type"]
+        meta_id = request.match_info["id"]
+        return await self._respond(
+            request,
+            "meta",
+            f"meta/{media_type}/{meta_id}",
+            lambda: {"meta": self._by_id.get((media_type, meta_id))},
+        )
+
+
+async def start(
+    addon: FakeAddon, host: str = "127.0.0.1", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Serve the add-on and return its runner and base URL."""
+    runner = web.AppRunner(addon.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    return runner, f"http://{host}:{runner.addresses[0][1]}"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the add-on options to a command line parser."""
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--no-etag", action="store_true")
+    parser.add_argument("--max-age", type=int)
+
+
+def options_from_arguments(args: argparse.Namespace) -> FakeAddonOptions:
+    """Return the add-on options of parsed command line arguments."""
+    return FakeAddonOptions(
+        items=args.items,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        etag=not args.no_etag,
+        max_age=args.max_age,
+    )
+
+
+def main() -> None:
+    """Serve the fake add-on until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=11470)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    web.run_app(
+        FakeAddon(options_from_arguments(args)).app(),
+        host="127.0.0.1",
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
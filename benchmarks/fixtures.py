@@ -0,0 +1,154 @@
+"""
+Catalog payloads for the benchmarks.
+
+Payloads recorded from Cinemeta are read from ``benchmarks/fixtures`` when
+present. To record them (this needs internet access), run from the
+repository root:
+
+    python -m benchmarks.fixtures --record
+
+Otherwise a deterministic payload in the shape of a Cinemeta catalog page is
+synthesized, with long descriptions, cast, trailers, links and videos on every
+meta, so results stay comparable between commits and machines.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import urllib.request
+from pathlib import Path
+
+from custom_components.stremio.api import build_catalog_url
+from custom_components.stremio.const import (
+    API_HEADERS,
+    CATALOG_PAGE_SIZE,
+    STREMIO_API_BASE_URL,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+IMAGES_URL = "https://images.metahub.space"
+MEDIA_TYPES = ("movie", "series")
+SIZES = (10, 100, 500)
+
+GENRES = [
+    "Action",
+    "Adventure",
+    "Animation",
+    "Comedy",
+    "Crime",
+    "Documentary",
+    "Drama",
+    "Family",
+    "Fantasy",
+    "Horror",
+    "Mystery",
+    "Romance",
+    "Sci-Fi",
+    "Thriller",
+]
+STATUSES = ["Continuing", "Ended", "Returning Series"]
+
+
+def fixture_path(media_type: str, items: int) -> Path:
+    """Return the path of a recorded payload."""
+    return FIXTURES_DIR / f"{media_type}-{items}.json"
+
+
+def build_meta(media_type: str, i: int, rng: random.Random) -> dict:
+    """Return a meta shaped like a Cinemeta catalog entry."""
+    imdb_id = f"tt{1000000 + i}"
+    year = 1980 + rng.randrange(45)
+    meta = {
+        "id": imdb_id,
+        "imdb_id": imdb_id,
+        "type": media_type,
+        "name": f"Title {i}",
+        "poster": f"{IMAGES_URL}/poster/small/{imdb_id}/img",
+        "background": f"{IMAGES_URL}/background/medium/{imdb_id}/img",
+        "logo": f"{IMAGES_URL}/logo/medium/{imdb_id}/img",
+        "genre": rng.sample(GENRES, rng.randint(1, 3)),
+        "director": [f"Director {rng.randrange(200)}"],
+        "cast": [f"Actor {rng.randrange(5000)}" for _ in range(10)],
+        "imdbRating": f"{rng.uniform(4, 9.5):.1f}",
+        "releaseInfo": str(year),
+        "description": "A long plot summary. " * rng.randint(10, 40),
+        "trailers": [{"source": f"yt{i}{n}", "type": "Trailer"} for n in range(3)],
+        "links": [
+            {"name": f"Link {n}", "category": "Cast", "url": f"stremio:///x/{n}"}
+            for n in range(20)
+        ],
+        "popularity": rng.random(),
+    }
+
+    if media_type == "series":
+        seasons = rng.randint(1, 8)
+        meta["releaseInfo"] = f"{year}-"
+        meta["status"] = rng.choice(STATUSES)
+        meta["seasonCount"] = seasons
+        meta["episodeCount"] = seasons * 10
+        meta["videos"] = [
+            {
+                "id": f"{imdb_id}:{season}:{episode}",
+                "title": f"Episode {episode}",
+                "season": season,
+                "episode": episode,
+                "released": f"{year + season}-01-01T00:00:00.000Z",
+            }
+            for season in range(1, seasons + 1)
+            for episode in range(1, 11)
+        ]
+    else:
+        meta["runtime"] = f"{rng.randint(80, 180)} min"
+
+    return meta
+
+
+def build_payload(media_type: str, items: int) -> bytes:
+    """Return a synthesized catalog body with the given number of metas."""
+    rng = random.Random(f"{media_type}-{items}")  # noqa: S311
+    metas = [build_meta(media_type, i, rng) for i in range(items)]
+    return json.dumps({"metas": metas}).encode()
+
+
+def load_payload(media_type: str, items: int) -> tuple[bytes, str]:
+    """Return a catalog body and where it comes from, recorded or synthetic."""
+    path = fixture_path(media_type, items)
+    if path.exists():
+        return path.read_bytes(), "recorded"
+    return build_payload(media_type, items), "synthetic"
+
+
+def record(media_type: str, items: int) -> None:
+    """Download the top catalog of a media type into a fixture."""
+    base_url = STREMIO_API_BASE_URL[media_type]
+    metas: list = []
+
+    while len(metas) < items:
+        url = build_catalog_url(base_url, {"skip": len(metas)})
+        request = urllib.request.Request(url, headers=API_HEADERS)  # noqa: S310
+        with urllib.request.urlopen(request, timeout=30) as response:  # noqa: S310
+            page = json.load(response).get("metas") or []
+        metas.extend(page)
+        if len(page) < CATALOG_PAGE_SIZE:
+            break
+
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    fixture_path(media_type, items).write_text(json.dumps({"metas": metas[:items]}))
+    print(f"{fixture_path(media_type, items)}: {len(metas[:items])} metas")  # noqa: T201
+
+
+def main() -> None:
+    """Record the fixtures of every media type and size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--record", action="store_true", required=True)
+    parser.parse_args()
+
+    for media_type in MEDIA_TYPES:
+        for items in SIZES:
+            record(media_type, items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+End-to-end load test of the integration against the fake add-on.
+
+Boots a bare Home Assistant in a temporary configuration directory, points
+the catalogs at a local ``benchmarks.fake_addon`` server, and sets up many
+config entries for every media type, each with every genre enabled. Run from
+the repository root:
+
+    python -m benchmarks.load --entries 20 --cycles 5 --latency 0.05
+
+The first row covers the setup of all entries, which includes their first
+refresh. Each following row refreshes every shared catalog coordinator at
+once and reports:
+
+- ``requests``: requests the add-on served during the cycle, with how many
+  were answered ``304 Not Modified``, throttled or failed; pass ``--no-etag``
+  to have every cycle download full bodies
+- ``wall_ms``: wall time until every coordinator finished
+- ``loop_lag_max_ms`` and ``loop_lag_p95_ms``: how late a timer that should
+  fire every 10 ms actually fired, a measure of event loop blocking
+- ``rss_mib``: peak resident memory of the process
+- the request counters of the integration's API client
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import socket
+import tempfile
+import time
+from dataclasses import asdict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from homeassistant import auth, bootstrap, config_entries, core, loader
+from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL
+from homeassistant.setup import async_setup_component
+
+from custom_components.stremio import const
+from custom_components.stremio.const import (
+    CONF_GENRES,
+    CONF_LIMIT,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MEDIA_TYPE,
+    CONF_RATE_LIMIT,
+    DOMAIN,
+)
+from custom_components.stremio.coordinator import async_get_hub
+
+from . import fake_addon
+from .fixtures import GENRES, MEDIA_TYPES
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+LAG_INTERVAL = 0.01
+
+
+class LoopLagMonitor:
+    """Sample how late the event loop runs a periodic timer."""
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Sleep for a fixed interval and record the overshoot."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.samples.append(max(loop.time() - start - LAG_INTERVAL, 0))
+
+    def summary(self) -> dict[str, float]:
+        """Return the maximum and 95th percentile lag, and reset the samples."""
+        samples = sorted(self.samples)
+        self.samples = []
+        if not samples:
+            return {"loop_lag_max_ms": 0.0, "loop_lag_p95_ms": 0.0}
+        return {
+            "loop_lag_max_ms": round(samples[-1] * 1000, 2),
+            "loop_lag_p95_ms": round(samples[int(len(samples) * 0.95)] * 1000, 2),
+        }
+
+
+def rss_mib() -> float:
+    """Return the peak resident memory of the process, in MiB."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def free_port() -> int:
+    """Return a TCP port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def async_boot(config_dir: str, *, start: bool = True) -> core.HomeAssistant:
+    """Boot a bare Home Assistant with the HTTP server on a free port."""
+    hass = core.HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    hass.auth = await auth.auth_manager_from_config(hass, [], [])
+    await async_setup_component(
+        hass, "http", {"http": {"server_host": "127.0.0.1", "server_port": free_port()}}
+    )
+    if start:
+        await hass.async_start()
+    return hass
+
+
+def build_entry(
+    index: int, media_type: str, limit: int, options: dict[str, Any]
+) -> config_entries.ConfigEntry:
+    """Return a config entry with every genre enabled."""
+    return config_entries.ConfigEntry(
+        data={
+            CONF_NAME: f"Stremio {media_type} {index}",
+            CONF_MEDIA_TYPE: media_type,
+            CONF_GENRES: GENRES,
+            CONF_LIMIT: limit,
+            CONF_SCAN_INTERVAL: 3600,
+        },
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options=options,
+        source=config_entries.SOURCE_USER,
+        title=f"Stremio {media_type} {index}",
+        unique_id=f"{media_type}-{index}",
+        version=1,
+    )
+
+
+class LoadTest:
+    """Run refresh cycles and collect one row of metrics per cycle."""
+
+    def __init__(self, hass: core.HomeAssistant, addon: fake_addon.FakeAddon) -> None:
+        """Initialize the load test."""
+        self.hass = hass
+        self.addon = addon
+        self.monitor = LoopLagMonitor()
+
+    async def async_measure(self, phase: str, work: Awaitable[Any]) -> dict[str, Any]:
+        """Run some work and return the metrics of the add-on, client and loop."""
+        hub = async_get_hub(self.hass)
+        served = asdict(self.addon.stats)
+        client = asdict(hub.client.request_stats)
+        self.monitor.samples = []
+
+        start = time.perf_counter()
+        await work
+        wall = time.perf_counter() - start
+
+        after = asdict(self.addon.stats)
+        row: dict[str, Any] = {
+            "phase": phase,
+            "coordinators": len(hub.coordinators),
+            "requests": after["requests"] - served["requests"],
+            "not_modified": after["not_modified"] - served["not_modified"],
+            "throttled": after["throttled"] - served["throttled"],
+            "errors": after["errors"] - served["errors"],
+            "sent_kib": round((after["bytes_sent"] - served["bytes_sent"]) / 1024, 1),
+            "wall_ms": round(wall * 1000, 1),
+        }
+        row.update(self.monitor.summary())
+        row["rss_mib"] = rss_mib()
+        row["client"] = {
+            key: value - client[key]
+            for key, value in asdict(hub.client.request_stats).items()
+            if isinstance(value, int)
+        }
+        return row
+
+    async def async_setup_entries(
+        self, entries: int, options: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Add and set up the entries of every media type."""
+
+        async def setup() -> None:
+            await asyncio.gather(
+                *(
+                    self.hass.config_entries.async_add(
+                        build_entry(index, media_type, 10 + 5 * (index % 9), options)
+                    )
+                    for index in range(entries)
+                    for media_type in MEDIA_TYPES
+                )
+            )
+            await self.hass.async_block_till_done()
+
+        return await self.async_measure("setup", setup())
+
+    async def async_cycle(self, cycle: int) -> dict[str, Any]:
+        """Refresh every catalog coordinator at once, as a due poll would."""
+        hub = async_get_hub(self.hass)
+        # Age the genre indexes past their max_age, so they crawl again
+        for index in hub._genre_indexes.values():  # noqa: SLF001
+            index._built = None  # noqa: SLF001
+
+        async def refresh() -> None:
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh()
+                    for coordinator in hub.coordinators.values()
+                )
+            )
+
+        return await self.async_measure(f"cycle {cycle}", refresh())
+
+
+async def async_run(args: argparse.Namespace) -> None:
+    """Run the load test and print one JSON line per phase."""
+    addon = fake_addon.FakeAddon(fake_addon.options_from_arguments(args))
+    runner, base_url = await fake_addon.start(addon)
+    for media_type in MEDIA_TYPES:
+        const.STREMIO_API_BASE_URL[media_type] = f"{base_url}/catalog/{media_type}/top"
+
+    options: dict[str, Any] = {}
+    if args.rate_limit is not None:
+        options[CONF_RATE_LIMIT] = args.rate_limit
+    if args.max_concurrent_requests is not None:
+        options[CONF_MAX_CONCURRENT_REQUESTS] = args.max_concurrent_requests
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_boot(config_dir)
+        test = LoadTest(hass, addon)
+        test.monitor.start()
+        try:
+            print(json.dumps(await test.async_setup_entries(args.entries, options)))  # noqa: T201
+            for cycle in range(1, args.cycles + 1):
+                print(json.dumps(await test.async_cycle(cycle)))  # noqa: T201
+        finally:
+            await test.monitor.stop()
+            await hass.async_stop()
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Parse the command line and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10, help="per media type")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--rate-limit", type=int, help="requests per minute")
+    parser.add_argument("--max-concurrent-requests", type=int)
+    parser.add_argument("--verbose", action="store_true")
+    fake_addon.add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+    asyncio.run(async_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Benchmark the catalog pipeline, from response body to card entries.
+
+Run from the repository root:
+
+    python -m benchmarks.pipeline --output before.json
+    python -m benchmarks.pipeline --compare before.json
+
+For movie and series payloads of every fixture size, it measures:
+
+- ``decode``: streaming decode with projection onto ``StremioMeta``, as the
+  API client does
+- ``format_cold``: formatting every item for upcoming-media-card
+- ``format_warm``: formatting the same batch again, as an unchanged refresh
+- ``format_genres``: formatting the items of each genre, as one sensor per
+  genre would, with titles listed by several genres formatted once
+
+Each row holds the best wall time over the rounds, the time per item, the
+peak traced memory, and the memory and allocated blocks still held by the
+result. Rows print as JSON lines; ``--compare`` adds the ratio of every metric
+to a previous run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from custom_components.stremio.api import MetasStreamDecoder
+from custom_components.stremio.const import STREAM_CHUNK_SIZE
+from custom_components.stremio.data import StremioMeta
+from custom_components.stremio.sensor import StremioItemStore
+
+from .fixtures import MEDIA_TYPES, SIZES, load_payload
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+TODAY = "2025-01-01"
+METRICS = ("best_ms", "per_item_us", "peak_kib", "retained_kib", "retained_blocks")
+
+
+def decode(body: bytes) -> list[StremioMeta]:
+    """Stream-decode a whole catalog body into the meta model."""
+    decoder = MetasStreamDecoder(StremioMeta.from_meta)
+    metas: list[StremioMeta] = []
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        metas.extend(decoder.feed(body[start : start + STREAM_CHUNK_SIZE]))
+    metas.extend(decoder.close())
+    return metas
+
+
+def format_genres(
+    media_type: str, metas: list[StremioMeta]
+) -> tuple[StremioItemStore, list[list[dict[str, Any]]]]:
+    """Format the items of each genre into one shared store."""
+    by_genre: dict[str, list[StremioMeta]] = {}
+    for meta in metas:
+        for genre in meta.genre:
+            by_genre.setdefault(genre, []).append(meta)
+
+    store = StremioItemStore(media_type)
+    return store, [
+        store.format(genre, items, TODAY) for genre, items in by_genre.items()
+    ]
+
+
+def measure(func: Callable[[], Any], items: int, rounds: int) -> dict[str, float]:
+    """Return the timing and memory metrics of a pipeline stage."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    blocks = sum(
+        stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+    )
+    tracemalloc.stop()
+    del result
+
+    return {
+        "best_ms": round(best * 1000, 3),
+        "per_item_us": round(best * 1e6 / items, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(retained / 1024, 1),
+        "retained_blocks": blocks,
+    }
+
+
+def run(rounds: int) -> list[dict[str, Any]]:
+    """Benchmark every stage on every payload."""
+    rows = []
+
+    for media_type in MEDIA_TYPES:
+        for size in SIZES:
+            body, source = load_payload(media_type, size)
+            metas = decode(body)
+            warm = StremioItemStore(media_type)
+            warm.format("warm", metas, TODAY)
+
+            stages: dict[str, Callable[[], Any]] = {
+                "decode": lambda body=body: decode(body),
+                "format_cold": lambda media_type=media_type, metas=metas: (
+                    StremioItemStore(media_type).format("cold", metas, TODAY)
+                ),
+                "format_warm": lambda warm=warm, metas=metas: (
+                    warm.format("warm", metas, TODAY)
+                ),
+                "format_genres": lambda media_type=media_type, metas=metas: (
+                    format_genres(media_type, metas)
+                ),
+            }
+
+            for stage, func in stages.items():
+                row = {
+                    "stage": stage,
+                    "media_type": media_type,
+                    "items": len(metas),
+                    "payload": source,
+                    "body_kib": round(len(body) / 1024, 1),
+                }
+                row.update(measure(func, max(len(metas), 1), rounds))
+                rows.append(row)
+
+    return rows
+
+
+def compare(rows: list[dict[str, Any]], baseline: list[dict[str, Any]]) -> None:
+    """Add the ratio of every metric to the matching baseline row."""
+    previous = {
+        (row["stage"], row["media_type"], row["items"], row["payload"]): row
+        for row in baseline
+    }
+    for row in rows:
+        old = previous.get(
+            (row["stage"], row["media_type"], row["items"], row["payload"])
+        )
+        if old is None:
+            continue
+        row["ratio"] = {
+            metric: round(row[metric] / old[metric], 3)
+            for metric in METRICS
+            if old.get(metric)
+        }
+
+
+def revision() -> str | None:
+    """Return the current git commit, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Run the benchmark and print one JSON line per stage and payload."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="results of a previous run")
+    args = parser.parse_args()
+
+    rows = run(args.rounds)
+    if args.compare:
+        compare(rows, json.loads(args.compare.read_text())["results"])
+
+    for row in rows:
+        print(json.dumps(row))  # noqa: T201
+
+    if args.output:
+        document = {
+            "commit": revision(),
+            "python": platform.python_version(),
+            "rounds": args.rounds,
+            "results": rows,
+        }
+        args.output.write_text(json.dumps(document, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Benchmark how long the integration takes to import and to set up.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --entries 5 --latency 0.2
+
+``import`` rows import a module of the integration in a fresh interpreter
+that has already imported the Home Assistant modules every integration uses,
+so they only count what the integration adds: the best wall time over the
+rounds and the modules the import loaded, besides the integration's own.
+
+``setup`` rows boot a bare Home Assistant against ``benchmarks.fake_addon``
+and add entries for every media type, each with every genre enabled, once
+while Home Assistant is starting, as at boot, and once after it has started,
+as for an entry added from the UI. Each reports the wall time of the setup,
+the catalog requests it waited on, and the sensors with a state once it
+returned. While starting, the catalogs are fetched once Home Assistant has
+started, and ``loaded_ms`` is how long that took.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any
+
+from custom_components.stremio import const
+
+from . import fake_addon
+from .fixtures import MEDIA_TYPES
+from .load import async_boot, build_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Imported by Home Assistant before any integration platform
+PRELOADED = (
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.storage",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+)
+MODULES = (
+    "custom_components.stremio",
+    "custom_components.stremio.sensor",
+    "custom_components.stremio.binary_sensor",
+    "custom_components.stremio.config_flow",
+)
+IMPORT_SCRIPT = """
+import json, sys, time
+{preloaded}
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, sorted(set(sys.modules) - before)]))
+"""
+
+
+def measure_import(module: str, rounds: int) -> dict[str, Any]:
+    """Return the import time of a module and the modules it loaded."""
+    script = IMPORT_SCRIPT.format(
+        preloaded="\n".join(f"import {name}" for name in PRELOADED), module=module
+    )
+    best = float("inf")
+    loaded: list[str] = []
+
+    # The first round also writes the bytecode caches
+    for _ in range(rounds + 1):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", script], capture_output=True, check=True, text=True
+        )
+        elapsed, loaded = json.loads(result.stdout.splitlines()[-1])
+        best = min(best, elapsed)
+
+    return {
+        "phase": "import",
+        "module": module,
+        "best_ms": round(best * 1000, 2),
+        "integration_modules": len(
+            [name for name in loaded if name.startswith("custom_components.")]
+        ),
+        "other_modules": [
+            name
+            for name in loaded
+            if not name.startswith("custom_components") and "." not in name
+        ],
+    }
+
+
+async def async_measure_setup(
+    args: argparse.Namespace, *, started: bool
+) -> dict[str, Any]:
+    """Set up the entries while Home Assistant starts or once it has started."""
+    addon = fake_addon.FakeAddon(fake_addon.options_from_arguments(args))
+    runner, base_url = await fake_addon.start(addon)
+    for media_type in MEDIA_TYPES:
+        const.STREMIO_API_BASE_URL[media_type] = f"{base_url}/catalog/{media_type}/top"
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_boot(config_dir, start=started)
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    hass.config_entries.async_add(
+                        build_entry(index, media_type, 20, {})
+                    )
+                    for index in range(args.entries)
+                    for media_type in MEDIA_TYPES
+                )
+            )
+            await hass.async_block_till_done()
+            setup = time.perf_counter() - start
+
+            row: dict[str, Any] = {
+                "phase": "setup",
+                "hass": "running" if started else "starting",
+                "entries": args.entries * len(MEDIA_TYPES),
+                "setup_ms": round(setup * 1000, 1),
+                "requests": addon.stats.requests,
+                "sensors_with_state": _sensors_with_state(hass),
+            }
+
+            if not started:
+                start = time.perf_counter()
+                await hass.async_start()
+                await hass.async_block_till_done(wait_background_tasks=True)
+                row["loaded_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                row["requests_after_start"] = addon.stats.requests - row["requests"]
+                row["sensors_loaded"] = _sensors_with_state(hass)
+        finally:
+            await hass.async_stop()
+            await runner.cleanup()
+
+    return row
+
+
+def _sensors_with_state(hass: HomeAssistant) -> int:
+    """Return the number of catalog sensors with a known state."""
+    return len(
+        [
+            state
+            for state in hass.states.async_all("sensor")
+            if state.entity_id.startswith("sensor.stremio")
+            and "count" in state.attributes
+            and state.state not in ("unknown", "unavailable")
+        ]
+    )
+
+
+async def async_run(args: argparse.Namespace) -> None:
+    """Run the setup benchmarks and print one JSON line per row."""
+    for started in (False, True):
+        row = await async_measure_setup(args, started=started)
+        print(json.dumps(row))  # noqa: T201
+
+
+def main() -> None:
+    """Parse the command line and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=5, help="per media type")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--verbose", action="store_true")
+    fake_addon.add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    for module in MODULES:
+        print(json.dumps(measure_import(module, args.rounds)))  # noqa: T201
+
+    asyncio.run(async_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare full and streaming decode of a Stremio catalog response.
+
+Run from the repository root:
+
+    python -m benchmarks.stream_decode --items 100 --limit 10
+
+The payload is a synthesized Cinemeta movie catalog page (see
+``benchmarks.fixtures``). The full decode parses the whole body and
+slices it, as ``response.json()`` did; the streaming decode feeds
+``MetasStreamDecoder`` in network-sized chunks and stops at ``--limit``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any
+
+from custom_components.stremio.api import MetasStreamDecoder
+from custom_components.stremio.const import STREAM_CHUNK_SIZE
+
+from .fixtures import build_payload
+
+
+def full_decode(body: bytes, limit: int) -> list[Any]:
+    """Decode the whole body, then keep the first metas."""
+    return json.loads(body)["metas"][:limit]
+
+
+def stream_decode(body: bytes, limit: int) -> list[Any]:
+    """Feed the body in chunks and stop once enough metas are decoded."""
+    decoder = MetasStreamDecoder()
+    metas: list[Any] = []
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        metas.extend(decoder.feed(body[start : start + STREAM_CHUNK_SIZE]))
+        if decoder.done or len(metas) >= limit:
+            break
+    else:
+        metas.extend(decoder.close())
+    return metas[:limit]
+
+
+def measure(func: Any, body: bytes, limit: int, rounds: int) -> dict[str, float]:
+    """Return the best wall time and the peak traced memory of a decoder."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(body, limit)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(body, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"best_ms": best * 1000, "peak_kib": peak / 1024}
+
+
+def main() -> None:
+    """Run the benchmark and print one JSON line per decoder."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    body = build_payload("movie", args.items)
+    assert full_decode(body, args.limit) == stream_decode(body, args.limit)  # noqa: S101
+
+    for name, func in (("full", full_decode), ("stream", stream_decode)):
+        result = {
+            "decoder": name,
+            "items": args.items,
+            "limit": args.limit,
+            "body_kib": round(len(body) / 1024, 1),
+        }
+        result.update(
+            {
+                k: round(v, 3)
+                for k, v in measure(func, body, args.limit, args.rounds).items()
+            }
+        )
+        print(json.dumps(result))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -2,33 +2,54 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from typing import TYPE_CHECKING
 
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import async_get as get_device_registry
 from homeassistant.helpers.entity_registry import async_get as get_entity_registry
 
 from .const import (
+    CINEMETA_CATALOG,
+    CONF_CATALOG,
     CONF_GENRES,
+    CONF_IMAGE_PROXY,
+    CONF_LIGHTWEIGHT,
     CONF_LIMIT,
+    CONF_MANIFEST_URL,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_MEDIA_TYPE,
+    CONF_META_DETAILS,
+    CONF_RATE_LIMIT,
     DEFAULT_GENRES,
+    DEFAULT_IMAGE_PROXY,
+    DEFAULT_LIGHTWEIGHT,
     DEFAULT_LIMIT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_MEDIA_TYPE,
+    DEFAULT_META_DETAILS,
     DEFAULT_NAME,
+    DEFAULT_RATE_LIMIT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     LOGGER,
     MEDIA_TYPES,
 )
+from .coordinator import (
+    async_get_hub,
+    catalog_base_url,
+    scan_interval_from_config,
+)
+from .data import StremioData
+
+if TYPE_CHECKING:
+    from .data import StremioConfigEntry
 
 # Update platforms to include entity platform
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def async_setup_entry(hass: HomeAssistant, entry: StremioConfigEntry) -> bool:
     """Set up Stremio from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
@@ -50,6 +71,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
         CONF_GENRES: genres,
         CONF_MEDIA_TYPE: media_type,
+        CONF_RATE_LIMIT: entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        CONF_MAX_CONCURRENT_REQUESTS: entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        CONF_IMAGE_PROXY: entry.options.get(CONF_IMAGE_PROXY, DEFAULT_IMAGE_PROXY),
+        CONF_META_DETAILS: entry.options.get(CONF_META_DETAILS, DEFAULT_META_DETAILS),
+        CONF_LIGHTWEIGHT: entry.options.get(CONF_LIGHTWEIGHT, DEFAULT_LIGHTWEIGHT),
+        # Entries created before add-on support use Cinemeta
+        CONF_MANIFEST_URL: entry.data.get(CONF_MANIFEST_URL),
+        CONF_CATALOG: entry.data.get(CONF_CATALOG, CINEMETA_CATALOG),
     }
 
     # Register a device for this integration
@@ -74,6 +105,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN][entry.entry_id][CONF_GENRES],
     )
 
+    # Subscribe to the shared catalog coordinators, one per genre
+    hub = async_get_hub(hass)
+    await hub.async_setup()
+    config = hass.data[DOMAIN][entry.entry_id]
+    scan_interval = scan_interval_from_config(config[CONF_SCAN_INTERVAL])
+    hub.async_set_request_limits(
+        entry.entry_id, config[CONF_RATE_LIMIT], config[CONF_MAX_CONCURRENT_REQUESTS]
+    )
+    base_url = catalog_base_url(
+        media_type, config[CONF_MANIFEST_URL], config[CONF_CATALOG]
+    )
+    coordinators = {
+        genre: hub.async_subscribe(
+            entry.entry_id,
+            media_type,
+            genre,
+            config[CONF_LIMIT],
+            scan_interval,
+            base_url,
+            meta_details=config[CONF_META_DETAILS],
+        )
+        for genre in genres or [None]
+    }
+    entry.runtime_data = StremioData(hub=hub, coordinators=coordinators)
+
+    # Fetch catalogs missing from the snapshot; refresh the others in the background
+    await hub.async_refresh(coordinators.values())
+
     # Forward the setup to the sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -82,17 +141,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def async_unload_entry(hass: HomeAssistant, entry: StremioConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await entry.runtime_data.hub.async_unsubscribe(entry.entry_id)
 
     return unload_ok
 
 
-async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+async def update_listener(hass: HomeAssistant, entry: StremioConfigEntry) -> None:
     """Update when config_entry options update."""
     await hass.config_entries.async_reload(entry.entry_id)
 
@@ -1,101 +1,955 @@
-"""Sample API Client."""
+"""Stremio API client."""
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import json
+import random
 import socket
-from typing import Any
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
+from urllib.parse import quote, urlsplit
 
 import aiohttp
 import async_timeout
 
+from .const import (
+    API_HEADERS,
+    API_RATE_BURST,
+    API_RETRIES,
+    API_RETRY_BACKOFF,
+    API_TIMEOUT,
+    API_URL_STATS_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+    CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_RATE_LIMIT,
+    DURATION_BUCKETS,
+    LOGGER,
+    STREAM_CHUNK_SIZE,
+    STREAM_DRAIN_LIMIT,
+)
+from .data import StremioMeta
 
-class IntegrationBlueprintApiClientError(Exception):
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Mapping
+
+
+class StremioApiClientError(Exception):
     """Exception to indicate a general API error."""
 
 
-class IntegrationBlueprintApiClientCommunicationError(
-    IntegrationBlueprintApiClientError,
+class StremioApiClientCommunicationError(
+    StremioApiClientError,
 ):
     """Exception to indicate a communication error."""
 
 
-class IntegrationBlueprintApiClientAuthenticationError(
-    IntegrationBlueprintApiClientError,
+class StremioApiClientCircuitOpenError(
+    StremioApiClientCommunicationError,
 ):
-    """Exception to indicate an authentication error."""
+    """Exception to indicate requests to a host are paused after failures."""
+
+
+class StremioCatalogDescriptor(TypedDict):
+    """A catalog advertised by a Stremio add-on manifest."""
+
+    type: str
+    id: str
+    name: NotRequired[str]
+    extra: NotRequired[list[dict[str, Any]]]
+    extraRequired: NotRequired[list[str]]
+    genres: NotRequired[list[str]]
+
+
+class StremioManifest(TypedDict):
+    """A Stremio add-on manifest."""
+
+    id: str
+    version: str
+    name: str
+    types: list[str]
+    catalogs: list[StremioCatalogDescriptor]
+    resources: NotRequired[list[str | dict[str, Any]]]
+    description: NotRequired[str]
+
+
+@dataclass
+class StremioCacheStats:
+    """Counters of the HTTP response cache."""
+
+    hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the share of requests answered without a download."""
+        total = self.hits + self.revalidations + self.misses
+        return (self.hits + self.revalidations) / total if total else 0.0
+
+
+@dataclass
+class StremioRequestStats:
+    """Counters of the requests made by the client."""
+
+    # Requests sent to a server
+    requests: int = 0
+    # Calls answered by joining an identical request already in flight
+    coalesced: int = 0
+    # Attempts repeated after a communication error
+    retries: int = 0
+    # Calls refused without a request while a host's circuit was open
+    rejected: int = 0
+    # Seconds spent waiting for a connection slot and a rate limit token
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+
+    @property
+    def queue_wait_avg(self) -> float:
+        """Return the average queue wait of a request, in seconds."""
+        return self.queue_wait_total / self.requests if self.requests else 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        """Record the queue wait of a request."""
+        self.queue_wait_total += seconds
+        self.queue_wait_max = max(self.queue_wait_max, seconds)
+
+
+@dataclass
+class StremioDurationHistogram:
+    """Durations counted by the bounds of ``DURATION_BUCKETS``, in seconds."""
+
+    # One count per bound, then one for longer durations
+    counts: list[int] = field(default_factory=lambda: [0] * (len(DURATION_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    last: float | None = None
+
+    def record(self, seconds: float) -> None:
+        """Count a duration."""
+        self.counts[bisect_left(DURATION_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram with cumulative buckets, in milliseconds."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, self.counts, strict=False):
+            cumulative += count
+            buckets[f"le_{bound * 1000:g}ms"] = cumulative
+        buckets["le_inf"] = self.count
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total * 1000 / self.count, 2) if self.count else None,
+            "last_ms": None if self.last is None else round(self.last * 1000, 2),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class StremioUrlStats:
+    """Counters of the requests sent for one URL."""
+
+    requests: int = 0
+    errors: int = 0
+    bytes_received: int = 0
+    # From sending the request to reading the body
+    latency: StremioDurationHistogram = field(default_factory=StremioDurationHistogram)
+    # Time spent decoding catalog bodies, part of the latency
+    decode: StremioDurationHistogram = field(default_factory=StremioDurationHistogram)
+    last_error: str | None = None
+    # Wall clock time of the last error
+    last_error_at: float | None = None
+
+    def record_error(self, err: Exception) -> None:
+        """Remember the last error."""
+        self.errors += 1
+        self.last_error = str(err) or type(err).__name__
+        self.last_error_at = time.time()
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """A parsed response together with its HTTP validators."""
+
+    data: Any
+    etag: str | None
+    last_modified: str | None
+    expires: float
+
+
+class _TokenBucket:
+    """A token bucket handing out tokens in arrival order."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the bucket with ``rate`` tokens per second."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> None:
+        """Wait for a token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _CircuitBreaker:
+    """
+    Stop requests to a host after repeated failures.
 
+    After ``CIRCUIT_FAILURE_THRESHOLD`` failures in a row the circuit opens
+    and requests are refused for a reset timeout. Then a single probe request
+    is let through: success closes the circuit, failure opens it again for
+    twice as long, up to ``CIRCUIT_MAX_RESET_TIMEOUT``.
+    """
 
-def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
-    """Verify that the response is valid."""
-    if response.status in (401, 403):
-        msg = "Invalid credentials"
-        raise IntegrationBlueprintApiClientAuthenticationError(
-            msg,
+    def __init__(self) -> None:
+        """Initialize a closed circuit."""
+        self.failures = 0
+        self.reset_timeout = CIRCUIT_RESET_TIMEOUT
+        self.open_until: float | None = None
+        # Times the circuit opened
+        self.trips = 0
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are refused."""
+        return self.open_until is not None and (
+            self._probing or time.monotonic() < self.open_until
         )
-    response.raise_for_status()
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent."""
+        if self.open_until is None:
+            return True
+        if self.is_open:
+            return False
+        self._probing = True
+        return True
+
+    def release(self) -> None:
+        """Let another request probe the circuit after a cancelled one."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.reset_timeout = CIRCUIT_RESET_TIMEOUT
+        self.open_until = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit past the threshold."""
+        self.failures += 1
+        if self._probing:
+            self.reset_timeout = min(self.reset_timeout * 2, CIRCUIT_MAX_RESET_TIMEOUT)
+        elif self.failures < CIRCUIT_FAILURE_THRESHOLD:
+            return
+        self._probing = False
+        self.trips += 1
+        self.open_until = time.monotonic() + self.reset_timeout
+
+
+@dataclass(slots=True)
+class _InFlight:
+    """A request shared by every caller of the same URL."""
+
+    task: asyncio.Task[Any]
+    # Metas the request reads at most, None for the whole response
+    limit: int | None
+    waiters: int = 0
+
+    def covers(self, limit: int | None) -> bool:
+        """Return True if the request reads at least ``limit`` metas."""
+        return self.limit is None or (limit is not None and limit <= self.limit)
 
 
-class IntegrationBlueprintApiClient:
-    """Sample API Client."""
+@dataclass(slots=True)
+class StremioCatalogPage:
+    """The metas read from one catalog response."""
+
+    metas: list[StremioMeta]
+    # Number of metas read, including those dropped by the projection
+    count: int
+    # False when reading stopped before the end of the metas array
+    complete: bool
+    # Body bytes read
+    size: int = 0
+
+
+_INCOMPLETE = object()
+_WHITESPACE = " \t\n\r"
+_NUMBER_DELIMITERS = ",]}" + _WHITESPACE
+
+
+class MetasStreamDecoder:
+    """
+    Incrementally decode the ``metas`` array of a catalog response.
+
+    Bytes are fed as they arrive and each meta is returned as soon as its
+    closing brace has been read, so the caller can stop reading the body once
+    it has enough items. Other top-level keys are decoded and discarded.
+
+    With ``project``, each meta is passed through it as soon as it is decoded
+    and metas it maps to None are dropped; ``count`` still includes them.
+    With ``limit``, decoding stops right after that many metas are kept, so
+    ``count`` covers exactly the metas returned and the ones dropped before.
+    """
+
+    def __init__(
+        self, project: Callable[[Any], Any] | None = None, limit: int | None = None
+    ) -> None:
+        """Initialize the decoder."""
+        self._project = project
+        self._limit = limit
+        self._kept = 0
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "object"
+        self._key: Any = None
+        self._eof = False
+        self.count = 0
+        self.done = False
+
+    @property
+    def full(self) -> bool:
+        """Return True once ``limit`` metas have been kept."""
+        return self._limit is not None and self._kept >= self._limit
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Decode a chunk of the body and return the completed metas."""
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk)
+        self._pos = 0
+        return self._parse()
+
+    def close(self) -> list[Any]:
+        """Decode the end of the body and return the remaining metas."""
+        self._eof = True
+        self._buffer = self._buffer[self._pos :] + self._text.decode(b"", final=True)
+        self._pos = 0
+        metas = self._parse()
+        if not self.done and not self.full:
+            msg = "Truncated or invalid catalog response"
+            raise ValueError(msg)
+        return metas
+
+    def _next_char(self) -> str | None:
+        """Skip whitespace and return the next character, if buffered."""
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _decode_value(self) -> Any:
+        """Decode the next JSON value, or return _INCOMPLETE if not buffered."""
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return _INCOMPLETE
+
+        # A number may continue in the next chunk, as in "2." or "2.5e", unless
+        # a delimiter follows it
+        if (
+            not self._eof
+            and type(value) in (int, float)
+            and (
+                end == len(self._buffer) or self._buffer[end] not in _NUMBER_DELIMITERS
+            )
+        ):
+            return _INCOMPLETE
+
+        self._pos = end
+        return value
+
+    def _expect(self, char: str, expected: str) -> None:
+        """Consume an expected structural character."""
+        if char != expected:
+            msg = f"Unexpected {char!r} in catalog response, expected {expected!r}"
+            raise ValueError(msg)
+        self._pos += 1
+
+    def _parse(self) -> list[Any]:  # noqa: PLR0912
+        """Advance through the buffer, collecting completed metas."""
+        metas: list[Any] = []
+
+        while (
+            not self.done and not self.full and (char := self._next_char()) is not None
+        ):
+            state = self._state
+
+            if state == "object":
+                self._expect(char, "{")
+                self._state = "key"
+            elif state == "key":
+                if char == ",":
+                    self._pos += 1
+                elif char == "}":
+                    # No metas array in this response
+                    self._pos += 1
+                    self.done = True
+                elif (key := self._decode_value()) is _INCOMPLETE:
+                    break
+                else:
+                    self._key = key
+                    self._state = "colon"
+            elif state == "colon":
+                self._expect(char, ":")
+                self._state = "array" if self._key == "metas" else "value"
+            elif state == "value":
+                if self._decode_value() is _INCOMPLETE:
+                    break
+                self._state = "key"
+            elif state == "array":
+                self._expect(char, "[")
+                self._state = "metas"
+            elif char == ",":
+                self._pos += 1
+            elif char == "]":
+                self._pos += 1
+                self.done = True
+            elif (meta := self._decode_value()) is _INCOMPLETE:
+                break
+            else:
+                self.count += 1
+                if self._project is not None:
+                    meta = self._project(meta)
+                    if meta is None:
+                        continue
+                metas.append(meta)
+                self._kept += 1
+
+        return metas
+
+
+def _cache_max_age(cache_control: str | None) -> float | None:
+    """Return the freshness lifetime allowed by a Cache-Control header."""
+    if not cache_control:
+        return 0.0
+
+    max_age = 0.0
+    for directive in cache_control.lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "no-store":
+            return None
+        if name == "no-cache":
+            return 0.0
+        if name == "max-age":
+            try:
+                max_age = float(value.strip('"'))
+            except ValueError:
+                max_age = 0.0
+    return max_age
+
+
+def build_catalog_url(
+    base_url: str, extra: Mapping[str, str | int] | None = None
+) -> str:
+    """Return a catalog URL with its extra properties, such as genre and skip."""
+    extra_path = "&".join(
+        f"{name}={quote(str(value), safe='')}"
+        for name, value in (extra or {}).items()
+        if value
+    )
+
+    if extra_path:
+        return f"{base_url}/{extra_path}.json"
+    return f"{base_url}.json"
+
+
+def addon_url(url: str) -> str:
+    """Return the transport URL of an add-on from its manifest URL."""
+    return url.removesuffix("/manifest.json").rstrip("/")
+
+
+def addon_catalog_url(manifest_url: str, media_type: str, catalog_id: str) -> str:
+    """Return the base URL of an add-on catalog."""
+    return f"{addon_url(manifest_url)}/catalog/{media_type}/{catalog_id}"
+
+
+def catalog_genres(catalog: StremioCatalogDescriptor) -> list[str]:
+    """Return the genre options of an add-on catalog."""
+    for extra in catalog.get("extra") or []:
+        if extra.get("name") == "genre" and extra.get("options"):
+            return [str(option) for option in extra["options"]]
+    # Older manifests advertise the genres on the catalog itself
+    return [str(genre) for genre in catalog.get("genres") or []]
+
+
+def addon_serves(manifest: StremioManifest, resource: str, media_type: str) -> bool:
+    """Return True if an add-on serves a resource, such as meta, for a media type."""
+    for entry in manifest.get("resources") or []:
+        if entry == resource:
+            return media_type in manifest.get("types", [])
+        if isinstance(entry, dict) and entry.get("name") == resource:
+            return media_type in entry.get("types", manifest.get("types", []))
+    return False
+
+
+def catalog_required_extras(catalog: StremioCatalogDescriptor) -> set[str]:
+    """Return the extra properties an add-on catalog cannot be listed without."""
+    required = {
+        str(extra.get("name"))
+        for extra in catalog.get("extra") or []
+        if extra.get("isRequired")
+    }
+    required.update(catalog.get("extraRequired") or [])
+    return required
+
+
+class StremioApiClient:
+    """Client for the Stremio add-on protocol."""
 
     def __init__(
         self,
-        username: str,
-        password: str,
         session: aiohttp.ClientSession,
+        max_connections_per_host: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
     ) -> None:
-        """Sample API Client."""
-        self._username = username
-        self._password = password
+        """Initialize the client."""
         self._session = session
+        self._max_connections_per_host = max_connections_per_host
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._circuit_breakers: dict[str, _CircuitBreaker] = {}
+        self._rate_limiter = _TokenBucket(rate_limit / 60, API_RATE_BURST)
+        self._cache: dict[str, _CacheEntry] = {}
+        self._in_flight: dict[str, _InFlight] = {}
+        self.cache_stats = StremioCacheStats()
+        self.request_stats = StremioRequestStats()
+        self.url_stats: OrderedDict[str, StremioUrlStats] = OrderedDict()
+
+    def set_limits(self, rate_limit: float, max_connections_per_host: int) -> None:
+        """Set the requests per minute and the concurrent requests per host."""
+        self._rate_limiter.rate = rate_limit / 60
+        if max_connections_per_host != self._max_connections_per_host:
+            # Requests holding a slot of the old semaphores finish unaffected
+            self._max_connections_per_host = max_connections_per_host
+            self._host_semaphores = {}
+
+    def forget(self, url: str) -> None:
+        """Drop the cached response of a URL."""
+        self._cache.pop(url, None)
+
+    async def async_iter_catalog(
+        self,
+        base_url: str,
+        extra: Mapping[str, str | int] | None = None,
+        *,
+        limit: int | None = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[StremioCatalogPage]:
+        """
+        Yield the pages of a catalog, following ``skip``.
+
+        Pages are requested lazily, only when the caller asks for the next
+        one. Add-ons choose their own page size, so the iteration ends at the
+        first empty page, or at a page with no new metas, as an add-on that
+        ignores ``skip`` repeats its page. With ``prefetch``, the next page is
+        requested while the caller processes the current one, but only while
+        fewer than ``limit`` metas have been yielded, so no page is fetched
+        that could not be used. Metas that cannot be shown are dropped and do
+        not count towards the limit.
+
+        With a ``limit``, the read of a page stops once the page covers it. If
+        the caller still asks for more, the rest of that page is fetched.
+        """
+        skip = 0
+        found = 0
+        seen: set[str] = set()
+        next_page: asyncio.Task[StremioCatalogPage] | None = None
+
+        try:
+            while True:
+                if next_page is not None:
+                    page = await next_page
+                    next_page = None
+                else:
+                    page = await self._async_get_page(
+                        base_url, extra, skip, None if limit is None else limit - found
+                    )
+
+                ids = {meta.id for meta in page.metas}
+                if not page.count or (ids and ids <= seen):
+                    return
+
+                skip += page.count
+                found += len(page.metas)
+                seen |= ids
+
+                if prefetch and page.complete and limit is not None and found < limit:
+                    next_page = asyncio.create_task(
+                        self._async_get_page(base_url, extra, skip, limit - found)
+                    )
+
+                yield page
+
+                if not page.complete:
+                    # The caller needs more than the partial read: finish the page
+                    limit = None
+        finally:
+            if next_page is not None:
+                if next_page.done() and not next_page.cancelled():
+                    # Retrieve the outcome of a page nobody asked for
+                    next_page.exception()
+                else:
+                    next_page.cancel()
+
+    async def _async_get_page(
+        self,
+        base_url: str,
+        extra: Mapping[str, str | int] | None,
+        skip: int,
+        limit: int | None,
+    ) -> StremioCatalogPage:
+        """Return one page of a catalog."""
+        url = build_catalog_url(base_url, {**(extra or {}), "skip": skip})
+        return await self._api_wrapper(url, cache=True, stream_metas=True, limit=limit)
+
+    async def async_get_meta(
+        self, base_url: str, media_type: str, meta_id: str
+    ) -> dict[str, Any]:
+        """Return the full meta of a title."""
+        data = await self._api_wrapper(f"{base_url}/meta/{media_type}/{meta_id}.json")
+        return data.get("meta") or {}
+
+    async def async_get_manifest(self, url: str) -> StremioManifest:
+        """Return the manifest of an add-on."""
+        manifest = await self._api_wrapper(
+            f"{addon_url(url)}/manifest.json", cache=True
+        )
+        if not isinstance(manifest, dict) or not isinstance(
+            manifest.get("catalogs"), list
+        ):
+            msg = f"Invalid add-on manifest: {url}"
+            raise StremioApiClientError(msg)
+        return manifest
+
+    def _store(
+        self,
+        url: str,
+        response: aiohttp.ClientResponse,
+        data: Any,
+        max_age: float | None,
+    ) -> None:
+        """Cache a parsed response if the server allows reusing it."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
 
-    async def async_get_data(self) -> Any:
-        """Get data from the API."""
-        return await self._api_wrapper(
-            method="get",
-            url="https://jsonplaceholder.typicode.com/posts/1",
+        if max_age is None or not (max_age or etag or last_modified):
+            self._cache.pop(url, None)
+            return
+
+        self._cache[url] = _CacheEntry(
+            data=data,
+            etag=etag,
+            last_modified=last_modified,
+            expires=time.monotonic() + max_age,
         )
 
-    async def async_set_title(self, value: str) -> Any:
-        """Get data from the API."""
-        return await self._api_wrapper(
-            method="patch",
-            url="https://jsonplaceholder.typicode.com/posts/1",
-            data={"title": value},
-            headers={"Content-type": "application/json; charset=UTF-8"},
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return the connection semaphore of a URL's host."""
+        host = urlsplit(url).netloc
+        if (semaphore := self._host_semaphores.get(host)) is None:
+            semaphore = asyncio.Semaphore(self._max_connections_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def _async_request_slot(self, url: str) -> AsyncIterator[None]:
+        """Wait for a connection slot of the URL's host and a rate limit token."""
+        start = time.monotonic()
+        async with self._host_semaphore(url):
+            await self._rate_limiter.async_acquire()
+            self.request_stats.record_wait(time.monotonic() - start)
+            yield
+
+    async def _async_read_metas(
+        self,
+        response: aiohttp.ClientResponse,
+        limit: int | None,
+        stats: StremioUrlStats,
+    ) -> StremioCatalogPage:
+        """Stream-decode the metas of a catalog response, up to a limit."""
+        decoder = MetasStreamDecoder(StremioMeta.from_meta, limit)
+        metas: list[StremioMeta] = []
+        read = 0
+        decoding = 0.0
+
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            read += len(chunk)
+            start = time.perf_counter()
+            metas.extend(decoder.feed(chunk))
+            decoding += time.perf_counter() - start
+            if decoder.done or decoder.full:
+                break
+        else:
+            start = time.perf_counter()
+            metas.extend(decoder.close())
+            decoding += time.perf_counter() - start
+
+        if not response.content.at_eof():
+            # Reading a short remainder, without decoding it, keeps the
+            # connection reusable. The length of a compressed body cannot be
+            # compared with the decompressed bytes read.
+            length = response.content_length
+            if (
+                length is not None
+                and aiohttp.hdrs.CONTENT_ENCODING not in response.headers
+                and length - read <= STREAM_DRAIN_LIMIT
+            ):
+                read += len(await response.content.read())
+            else:
+                response.close()
+
+        stats.decode.record(decoding)
+        return StremioCatalogPage(
+            metas, decoder.count, complete=decoder.done, size=read
         )
 
     async def _api_wrapper(
         self,
-        method: str,
         url: str,
-        data: dict | None = None,
-        headers: dict | None = None,
+        *,
+        cache: bool = False,
+        stream_metas: bool = False,
+        limit: int | None = None,
     ) -> Any:
         """Get information from the API."""
+        entry = self._cache.get(url) if cache else None
+
+        # A partial page cannot serve a request for more metas than it holds
+        if (
+            entry is not None
+            and isinstance(entry.data, StremioCatalogPage)
+            and not entry.data.complete
+            and (limit is None or len(entry.data.metas) < limit)
+        ):
+            entry = None
+
+        if entry is not None and entry.expires > time.monotonic():
+            self.cache_stats.hits += 1
+            return entry.data
+
+        if (flight := self._in_flight.get(url)) is not None and flight.covers(limit):
+            self.request_stats.coalesced += 1
+        else:
+            task = asyncio.create_task(
+                self._async_request(
+                    url, entry, cache=cache, stream_metas=stream_metas, limit=limit
+                )
+            )
+            flight = self._in_flight[url] = _InFlight(task, limit)
+            task.add_done_callback(partial(self._request_done, url, flight))
+
+        flight.waiters += 1
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            # Nobody else needs the response
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _request_done(self, url: str, flight: _InFlight, task: asyncio.Task) -> None:
+        """Forget a finished request and retrieve its outcome."""
+        if self._in_flight.get(url) is flight:
+            del self._in_flight[url]
+        if not task.cancelled():
+            # Callers that left before the end never retrieve the error
+            task.exception()
+
+    def is_circuit_open(self, url: str) -> bool:
+        """Return True while requests to a URL's host are refused."""
+        breaker = self._circuit_breakers.get(urlsplit(url).netloc)
+        return breaker is not None and breaker.is_open
+
+    def circuit_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the circuit breaker state of every host."""
+        return {
+            host: {
+                "open": breaker.is_open,
+                "failures": breaker.failures,
+                "trips": breaker.trips,
+                "reset_timeout": breaker.reset_timeout,
+            }
+            for host, breaker in self._circuit_breakers.items()
+        }
+
+    def _url_stats(self, url: str) -> StremioUrlStats:
+        """Return the statistics of a URL, dropping the least recently used."""
+        if (stats := self.url_stats.get(url)) is None:
+            stats = self.url_stats[url] = StremioUrlStats()
+            if len(self.url_stats) > API_URL_STATS_MAX:
+                self.url_stats.popitem(last=False)
+        else:
+            self.url_stats.move_to_end(url)
+        return stats
+
+    async def _async_request(
+        self,
+        url: str,
+        entry: _CacheEntry | None,
+        *,
+        cache: bool,
+        stream_metas: bool,
+        limit: int | None,
+    ) -> Any:
+        """Send a request, retrying communication errors with backoff."""
+        host = urlsplit(url).netloc
+        if (breaker := self._circuit_breakers.get(host)) is None:
+            breaker = self._circuit_breakers[host] = _CircuitBreaker()
+
+        stats = self._url_stats(url)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self.request_stats.rejected += 1
+                msg = f"Requests to {host} paused after {breaker.failures} failures"
+                err = StremioApiClientCircuitOpenError(msg)
+                stats.record_error(err)
+                raise err
+
+            try:
+                data = await self._async_send(
+                    url,
+                    entry,
+                    stats,
+                    cache=cache,
+                    stream_metas=stream_metas,
+                    limit=limit,
                 )
-                _verify_response_or_raise(response)
-                return await response.json()
+            except StremioApiClientCommunicationError as err:
+                stats.record_error(err)
+                breaker.record_failure()
+                if attempt >= API_RETRIES or breaker.is_open:
+                    raise
+            except StremioApiClientError as err:
+                # The host answered, even if not with a catalog
+                stats.record_error(err)
+                breaker.record_success()
+                raise
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return data
+
+            delay = API_RETRY_BACKOFF * 2**attempt * random.uniform(0.5, 1)  # noqa: S311
+            attempt += 1
+            self.request_stats.retries += 1
+            LOGGER.debug(
+                "Tentativa %s da URL do Stremio %s em %.1f segundos",
+                attempt + 1,
+                url,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    async def _async_send(  # noqa: PLR0912, PLR0913
+        self,
+        url: str,
+        entry: _CacheEntry | None,
+        stats: StremioUrlStats,
+        *,
+        cache: bool,
+        stream_metas: bool,
+        limit: int | None,
+    ) -> Any:
+        """Send a request, made conditional by a stale cache entry."""
+        headers = API_HEADERS
+        if entry is not None:
+            headers = dict(API_HEADERS)
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        LOGGER.debug("Buscando dados do Stremio da URL: %s", url)
+        self.request_stats.requests += 1
+        stats.requests += 1
+
+        try:
+            async with self._async_request_slot(url):
+                start = time.perf_counter()
+                async with (
+                    async_timeout.timeout(API_TIMEOUT),
+                    self._session.get(url, headers=headers) as response,
+                ):
+                    max_age = _cache_max_age(response.headers.get("Cache-Control"))
+
+                    if entry is not None and response.status == 304:  # noqa: PLR2004
+                        self.cache_stats.revalidations += 1
+                        if max_age is not None:
+                            entry.expires = time.monotonic() + max_age
+                        stats.latency.record(time.perf_counter() - start)
+                        return entry.data
+
+                    response.raise_for_status()
+                    if stream_metas:
+                        data = await self._async_read_metas(response, limit, stats)
+                    else:
+                        data = await response.json(content_type=None)
+                    stats.bytes_received += response.content.total_bytes
+                    stats.latency.record(time.perf_counter() - start)
+
+                    if cache:
+                        self.cache_stats.misses += 1
+                        self._store(url, response, data, max_age)
+                    return data
 
         except TimeoutError as exception:
             msg = f"Timeout error fetching information - {exception}"
-            raise IntegrationBlueprintApiClientCommunicationError(
+            raise StremioApiClientCommunicationError(
+                msg,
+            ) from exception
+        except aiohttp.ClientResponseError as exception:
+            msg = f"Error fetching information - {exception}"
+            # Client errors other than throttling would fail again on retry
+            if exception.status < 500 and exception.status != 429:  # noqa: PLR2004
+                raise StremioApiClientError(
+                    msg,
+                ) from exception
+            raise StremioApiClientCommunicationError(
                 msg,
             ) from exception
         except (aiohttp.ClientError, socket.gaierror) as exception:
             msg = f"Error fetching information - {exception}"
-            raise IntegrationBlueprintApiClientCommunicationError(
+            raise StremioApiClientCommunicationError(
                 msg,
             ) from exception
         except Exception as exception:  # pylint: disable=broad-except
             msg = f"Something really wrong happened! - {exception}"
-            raise IntegrationBlueprintApiClientError(
+            raise StremioApiClientError(
                 msg,
             ) from exception
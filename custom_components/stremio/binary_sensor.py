@@ -1,4 +1,4 @@
-"""Binary sensor platform for integration_blueprint."""
+"""Binary sensor platform for Stremio integration."""
 
 from __future__ import annotations
 
@@ -10,52 +10,63 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 
-from .entity import IntegrationBlueprintEntity
+from .const import CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE, DOMAIN
+from .entity import StremioEntryEntity
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-    from .coordinator import BlueprintDataUpdateCoordinator
-    from .data import IntegrationBlueprintConfigEntry
+    from .data import StremioConfigEntry
 
-ENTITY_DESCRIPTIONS = (
-    BinarySensorEntityDescription(
-        key="integration_blueprint",
-        name="Integration Blueprint Binary Sensor",
-        device_class=BinarySensorDeviceClass.CONNECTIVITY,
-    ),
+REACHABLE_DESCRIPTION = BinarySensorEntityDescription(
+    key="reachable",
+    name="Servidor acessível",
+    device_class=BinarySensorDeviceClass.CONNECTIVITY,
 )
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
-    entry: IntegrationBlueprintConfigEntry,
+    hass: HomeAssistant,
+    entry: StremioConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the binary_sensor platform."""
+    """Set up the Stremio binary sensors from a config entry."""
+    config = hass.data[DOMAIN][entry.entry_id]
     async_add_entities(
-        IntegrationBlueprintBinarySensor(
-            coordinator=entry.runtime_data.coordinator,
-            entity_description=entity_description,
-        )
-        for entity_description in ENTITY_DESCRIPTIONS
+        [
+            StremioReachableBinarySensor(
+                list(entry.runtime_data.coordinators.values()),
+                entry.entry_id,
+                config.get(CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE),
+                REACHABLE_DESCRIPTION,
+            )
+        ]
     )
 
 
-class IntegrationBlueprintBinarySensor(IntegrationBlueprintEntity, BinarySensorEntity):
-    """integration_blueprint binary_sensor class."""
+class StremioReachableBinarySensor(StremioEntryEntity, BinarySensorEntity):
+    """
+    Whether the catalogs of an entry can be fetched from the Stremio servers.
 
-    def __init__(
-        self,
-        coordinator: BlueprintDataUpdateCoordinator,
-        entity_description: BinarySensorEntityDescription,
-    ) -> None:
-        """Initialize the binary_sensor class."""
-        super().__init__(coordinator)
-        self.entity_description = entity_description
+    Derived from the outcome of the last refresh of each catalog, without
+    requests of its own: the servers are reachable while at least one catalog
+    refreshed successfully and its host's circuit breaker is closed.
+    """
 
     @property
-    def is_on(self) -> bool:
-        """Return true if the binary_sensor is on."""
-        return self.coordinator.data.get("title", "") == "foo"
+    def is_on(self) -> bool | None:
+        """Return True if the last refresh of a catalog succeeded."""
+        refreshed = [
+            coordinator
+            for coordinator in self.coordinators
+            if coordinator.refresh_durations.count
+        ]
+        if not refreshed:
+            return None
+
+        return any(
+            coordinator.consecutive_failures == 0
+            and not coordinator.client.is_circuit_open(coordinator.url)
+            for coordinator in refreshed
+        )
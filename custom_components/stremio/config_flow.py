@@ -2,74 +2,131 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 from homeassistant.helpers import selector
 
+from .api import (
+    StremioApiClientError,
+    addon_url,
+    catalog_genres,
+    catalog_required_extras,
+)
 from .const import (
     AVAILABLE_GENRES,
+    CINEMETA_CATALOG,
+    CINEMETA_MANIFEST_URL,
+    CINEMETA_URL,
+    CONF_CATALOG,
     CONF_GENRES,
+    CONF_IMAGE_PROXY,
+    CONF_LIGHTWEIGHT,
     CONF_LIMIT,
+    CONF_MANIFEST_URL,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_MEDIA_TYPE,
+    CONF_META_DETAILS,
+    CONF_RATE_LIMIT,
     DEFAULT_GENRES,
+    DEFAULT_IMAGE_PROXY,
+    DEFAULT_LIGHTWEIGHT,
     DEFAULT_LIMIT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_MEDIA_TYPE,
+    DEFAULT_META_DETAILS,
     DEFAULT_NAME,
+    DEFAULT_RATE_LIMIT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     GENRE_TRANSLATIONS,
     MEDIA_TYPES,
     TRANSLATIONS,
 )
+from .coordinator import async_get_hub
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .api import StremioCatalogDescriptor, StremioManifest
+
+
+def _catalog_key(data: Mapping[str, Any]) -> tuple[str, str, str]:
+    """Return the add-on, media type and catalog shown by an entry."""
+    return (
+        addon_url(data.get(CONF_MANIFEST_URL) or CINEMETA_MANIFEST_URL),
+        data.get(CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE),
+        data.get(CONF_CATALOG, CINEMETA_CATALOG),
+    )
+
+
+def _genre_options(genres: list[str]) -> list[dict[str, str]]:
+    """Return translated genre options for a selector."""
+    return [
+        {"label": GENRE_TRANSLATIONS.get(genre, genre), "value": genre}
+        for genre in genres
+    ]
+
+
+def _usable_catalogs(
+    manifest: StremioManifest,
+) -> dict[str, StremioCatalogDescriptor]:
+    """Return the catalogs of a manifest that can be listed, by type and id."""
+    catalogs = {}
+    for catalog in manifest.get("catalogs") or []:
+        if not catalog.get("type") or not catalog.get("id"):
+            continue
+        required = catalog_required_extras(catalog)
+        if required - {"genre"} or (
+            "genre" in required and not catalog_genres(catalog)
+        ):
+            continue
+        catalogs[f"{catalog['type']}/{catalog['id']}"] = catalog
+    return catalogs
 
 
 class StremioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    """Handle a config flow for Stremio."""
+    """
+    Handle a config flow for Stremio.
+
+    The user picks an add-on by its manifest URL (Cinemeta by default), then
+    one of its catalogs, then the genres the catalog offers.
+    """
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._data: dict[str, Any] = {}
+        self._manifest: StremioManifest | None = None
+        self._catalogs: dict[str, StremioCatalogDescriptor] = {}
+        self._catalog: StremioCatalogDescriptor | None = None
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
 
         if user_input is not None:
-            # Ensure genres is always a list, even if none selected
-            genres = user_input.get(CONF_GENRES, DEFAULT_GENRES)
-            user_input[CONF_GENRES] = genres if genres else []
-
-            # Check if we already have an instance with the same media type
-            media_type = user_input.get(CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE)
+            manifest_url = user_input[CONF_MANIFEST_URL].strip()
+            hub = async_get_hub(self.hass)
+            await hub.async_setup()
 
-            # Look for existing entries with the same media type and genres
-            for entry in self._async_current_entries():
-                if entry.data.get(CONF_MEDIA_TYPE) == media_type and set(
-                    entry.data.get(CONF_GENRES, [])
-                ) == set(user_input[CONF_GENRES]):
-                    errors["base"] = "media_type_genre_already_configured"
-                    break
+            try:
+                manifest = await hub.manifests.async_get(manifest_url)
+            except StremioApiClientError:
+                errors["base"] = "manifest"
+            else:
+                self._catalogs = _usable_catalogs(manifest)
+                if not self._catalogs:
+                    errors["base"] = "no_catalogs"
 
             if not errors:
-                # Create title based on media type only, without adding genres
-                media_type_name = MEDIA_TYPES.get(media_type, media_type.capitalize())
-                title = f"Stremio {media_type_name}"
-
-                return self.async_create_entry(
-                    title=title,
-                    data=user_input,
-                )
-
-        # Prepare translated genre options for selector
-        genre_options = [
-            {"label": GENRE_TRANSLATIONS.get(genre, genre), "value": genre}
-            for genre in AVAILABLE_GENRES
-        ]
-
-        # Prepare media type options for selector
-        media_type_options = [
-            {"label": label, "value": value} for value, label in MEDIA_TYPES.items()
-        ]
+                self._manifest = manifest
+                self._data = {**user_input, CONF_MANIFEST_URL: manifest_url}
+                return await self.async_step_catalog()
 
         data_schema = vol.Schema(
             {
@@ -78,37 +135,17 @@ class StremioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     default=DEFAULT_NAME,
                     description={"suggested_value": DEFAULT_NAME},
                 ): str,
-                vol.Optional(
-                    CONF_MEDIA_TYPE,
-                    default=DEFAULT_MEDIA_TYPE,
-                    description={"suggested_value": DEFAULT_MEDIA_TYPE},
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=media_type_options,
-                        multiple=False,
-                        custom_value=False,
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                        translation_key="media_type",
-                    )
+                vol.Required(
+                    CONF_MANIFEST_URL,
+                    default=CINEMETA_MANIFEST_URL,
+                ): selector.TextSelector(
+                    selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
                 ),
                 vol.Optional(
                     CONF_LIMIT,
                     default=DEFAULT_LIMIT,
                     description={"suggested_value": DEFAULT_LIMIT},
                 ): vol.All(int, vol.Range(min=1, max=50)),
-                vol.Optional(
-                    CONF_GENRES,
-                    default=DEFAULT_GENRES,
-                    description={"suggested_value": DEFAULT_GENRES},
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=genre_options,
-                        multiple=True,
-                        custom_value=False,
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                        translation_key="genres",
-                    )
-                ),
                 vol.Optional(
                     CONF_SCAN_INTERVAL,
                     default=DEFAULT_SCAN_INTERVAL.total_seconds(),
@@ -126,6 +163,124 @@ class StremioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders=TRANSLATIONS,
         )
 
+    async def async_step_catalog(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Choose a catalog of the add-on."""
+        errors = {}
+
+        # Nothing to choose from an add-on with a single catalog
+        if user_input is None and len(self._catalogs) == 1:
+            user_input = {CONF_CATALOG: next(iter(self._catalogs))}
+
+        if user_input is not None:
+            self._catalog = catalog = self._catalogs[user_input[CONF_CATALOG]]
+            self._data[CONF_MEDIA_TYPE] = catalog["type"]
+            self._data[CONF_CATALOG] = catalog["id"]
+
+            if catalog_genres(catalog):
+                return await self.async_step_genres()
+
+            self._data[CONF_GENRES] = []
+            if self._is_configured():
+                errors["base"] = "media_type_genre_already_configured"
+            else:
+                return self._async_create_entry()
+
+        catalog_options = [
+            {
+                "label": "{} ({})".format(
+                    catalog.get("name") or catalog["id"],
+                    MEDIA_TYPES.get(catalog["type"], catalog["type"].capitalize()),
+                ),
+                "value": key,
+            }
+            for key, catalog in self._catalogs.items()
+        ]
+
+        return self.async_show_form(
+            step_id="catalog",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_CATALOG): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=catalog_options,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                }
+            ),
+            errors=errors,
+            description_placeholders=TRANSLATIONS,
+        )
+
+    async def async_step_genres(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Choose genres among those the catalog offers."""
+        errors = {}
+
+        if user_input is not None:
+            # Ensure genres is always a list, even if none selected
+            self._data[CONF_GENRES] = user_input.get(CONF_GENRES) or []
+
+            if not self._data[CONF_GENRES] and "genre" in catalog_required_extras(
+                self._catalog
+            ):
+                errors["base"] = "genre_required"
+            elif self._is_configured():
+                errors["base"] = "media_type_genre_already_configured"
+            else:
+                return self._async_create_entry()
+
+        return self.async_show_form(
+            step_id="genres",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_GENRES,
+                        default=DEFAULT_GENRES,
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=_genre_options(catalog_genres(self._catalog)),
+                            multiple=True,
+                            custom_value=False,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key="genres",
+                        )
+                    ),
+                }
+            ),
+            errors=errors,
+            description_placeholders=TRANSLATIONS,
+        )
+
+    def _is_configured(self) -> bool:
+        """Return True if an entry shows the same catalog and genres."""
+        return any(
+            _catalog_key(entry.data) == _catalog_key(self._data)
+            and set(entry.data.get(CONF_GENRES, [])) == set(self._data[CONF_GENRES])
+            for entry in self._async_current_entries()
+        )
+
+    @callback
+    def _async_create_entry(self) -> config_entries.ConfigFlowResult:
+        """Create the entry, titled after the add-on and catalog."""
+        media_type = self._data[CONF_MEDIA_TYPE]
+        media_type_name = MEDIA_TYPES.get(media_type, media_type.capitalize())
+
+        if addon_url(self._data[CONF_MANIFEST_URL]) == CINEMETA_URL:
+            # Create title based on media type only, without adding genres
+            title = f"Stremio {media_type_name}"
+        else:
+            title = "{} - {} ({})".format(
+                self._manifest.get("name") or DEFAULT_NAME,
+                self._catalog.get("name") or self._catalog["id"],
+                media_type_name,
+            )
+
+        return self.async_create_entry(title=title, data=self._data)
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -142,9 +297,34 @@ class StremioOptionsFlow(config_entries.OptionsFlow):
         """Initialize options flow."""
         self._config_entry = config_entry
 
+    async def _async_get_catalog(self) -> StremioCatalogDescriptor | None:
+        """Return the add-on catalog of the entry, or None if unavailable."""
+        hub = async_get_hub(self.hass)
+        await hub.async_setup()
+
+        try:
+            manifest = await hub.manifests.async_get(
+                self._config_entry.data[CONF_MANIFEST_URL]
+            )
+        except StremioApiClientError:
+            return None
+
+        return _usable_catalogs(manifest).get(
+            "/".join(
+                (
+                    self._config_entry.data.get(CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE),
+                    self._config_entry.data.get(CONF_CATALOG, CINEMETA_CATALOG),
+                )
+            )
+        )
+
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         errors = {}
+        # Entries created from a manifest list the genres of their catalog and
+        # keep the media type it serves
+        addon = CONF_MANIFEST_URL in self._config_entry.data
+        catalog = await self._async_get_catalog() if addon else None
 
         if user_input is not None:
             # Ensure genres is always a list, even if none selected
@@ -155,7 +335,13 @@ class StremioOptionsFlow(config_entries.OptionsFlow):
             media_type = user_input.get(CONF_MEDIA_TYPE)
             current_media_type = self._config_entry.data.get(CONF_MEDIA_TYPE)
 
-            if media_type != current_media_type:
+            if (
+                catalog is not None
+                and not user_input[CONF_GENRES]
+                and "genre" in catalog_required_extras(catalog)
+            ):
+                errors["base"] = "genre_required"
+            elif not addon and media_type != current_media_type:
                 # Look for existing entries with the same media type and genres
                 for entry in self.hass.config_entries.async_entries(DOMAIN):
                     if (
@@ -179,22 +365,29 @@ class StremioOptionsFlow(config_entries.OptionsFlow):
             self._config_entry.data.get(CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE),
         )
 
-        # Prepare translated genre options for selector
-        genre_options = [
-            {"label": GENRE_TRANSLATIONS.get(genre, genre), "value": genre}
-            for genre in AVAILABLE_GENRES
-        ]
+        if not addon:
+            available_genres = AVAILABLE_GENRES
+        else:
+            # Keep the selected genres choosable if the manifest is unavailable
+            # or no longer lists them
+            available_genres = catalog_genres(catalog) if catalog is not None else []
+            available_genres += [
+                genre for genre in current_genres if genre not in available_genres
+            ]
 
         # Prepare media type options for selector
         media_type_options = [
             {"label": label, "value": value} for value, label in MEDIA_TYPES.items()
         ]
 
-        options = {
-            vol.Optional(
-                CONF_MEDIA_TYPE,
-                default=current_media_type,
-            ): selector.SelectSelector(
+        options = {}
+        if not addon:
+            options[
+                vol.Optional(
+                    CONF_MEDIA_TYPE,
+                    default=current_media_type,
+                )
+            ] = selector.SelectSelector(
                 selector.SelectSelectorConfig(
                     options=media_type_options,
                     multiple=False,
@@ -202,7 +395,9 @@ class StremioOptionsFlow(config_entries.OptionsFlow):
                     mode=selector.SelectSelectorMode.DROPDOWN,
                     translation_key="media_type",
                 )
-            ),
+            )
+
+        options |= {
             vol.Optional(
                 CONF_LIMIT,
                 default=self._config_entry.options.get(
@@ -214,7 +409,7 @@ class StremioOptionsFlow(config_entries.OptionsFlow):
                 default=current_genres,
             ): selector.SelectSelector(
                 selector.SelectSelectorConfig(
-                    options=genre_options,
+                    options=_genre_options(available_genres),
                     multiple=True,
                     custom_value=False,
                     mode=selector.SelectSelectorMode.DROPDOWN,
@@ -230,6 +425,36 @@ class StremioOptionsFlow(config_entries.OptionsFlow):
                     ),
                 ),
             ): vol.All(int, vol.Range(min=300, max=86400)),
+            vol.Optional(
+                CONF_RATE_LIMIT,
+                default=self._config_entry.options.get(
+                    CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+                ),
+            ): vol.All(int, vol.Range(min=1, max=600)),
+            vol.Optional(
+                CONF_MAX_CONCURRENT_REQUESTS,
+                default=self._config_entry.options.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                ),
+            ): vol.All(int, vol.Range(min=1, max=10)),
+            vol.Optional(
+                CONF_IMAGE_PROXY,
+                default=self._config_entry.options.get(
+                    CONF_IMAGE_PROXY, DEFAULT_IMAGE_PROXY
+                ),
+            ): bool,
+            vol.Optional(
+                CONF_META_DETAILS,
+                default=self._config_entry.options.get(
+                    CONF_META_DETAILS, DEFAULT_META_DETAILS
+                ),
+            ): bool,
+            vol.Optional(
+                CONF_LIGHTWEIGHT,
+                default=self._config_entry.options.get(
+                    CONF_LIGHTWEIGHT, DEFAULT_LIGHTWEIGHT
+                ),
+            ): bool,
         }
 
         return self.async_show_form(
@@ -14,13 +14,117 @@ DEFAULT_LIMIT = 10
 DEFAULT_SCAN_INTERVAL = timedelta(hours=1)
 DEFAULT_GENRES = []  # Default to no genre filters
 DEFAULT_MEDIA_TYPE = "movie"  # Default to movies
+DEFAULT_RATE_LIMIT = 60  # Requests per minute, shared by every entry
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4  # Per host
+DEFAULT_IMAGE_PROXY = False
+DEFAULT_META_DETAILS = False
+DEFAULT_LIGHTWEIGHT = False
 
 # Configuration keys
 CONF_LIMIT = "limit"
 CONF_GENRES = "genres"
 CONF_MEDIA_TYPE = "media_type"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_IMAGE_PROXY = "image_proxy"
+CONF_META_DETAILS = "meta_details"
+CONF_LIGHTWEIGHT = "lightweight"
+CONF_MANIFEST_URL = "manifest_url"
+CONF_CATALOG = "catalog"
+
+# Refresh scheduling
+# Refreshes land within +/- this share of the interval
+SCAN_INTERVAL_JITTER = 0.1
+# The first refresh of a new catalog lands within this share of the interval
+SCAN_INTERVAL_STAGGER = 0.5
+# Stable catalogs poll less often, up to a multiple of the configured interval
+ADAPTIVE_INTERVAL_GROWTH = 1.5
+ADAPTIVE_INTERVAL_MAX_FACTOR = 4
+ADAPTIVE_INTERVAL_MAX = timedelta(days=1)
+
+# hass.data keys
+DATA_HUB = "hub"
+DATA_ITEM_STORES = "item_stores"
+
+# Storage
+STORAGE_KEY = f"{DOMAIN}.catalogs"
+STORAGE_VERSION = 1
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_FIELDS = (
+    "id",
+    "name",
+    "poster",
+    "background",
+    "director",
+    "genre",
+    "imdbRating",
+    "runtime",
+    "description",
+    "episodeCount",
+    "seasonCount",
+    "status",
+)
+SNAPSHOT_SAVE_DELAY = 30
+SNAPSHOT_MAX_AGE = timedelta(days=7)
+MANIFEST_STORAGE_KEY = f"{DOMAIN}.manifests"
+# Add-on manifests younger than this are used without a request
+MANIFEST_TTL = timedelta(days=1)
+META_STORAGE_KEY = f"{DOMAIN}.metas"
+# Title details younger than this are used without a request
+META_TTL = timedelta(days=7)
+# Titles with details kept, least recently used dropped
+META_CACHE_MAX = 2000
+# Title details fetched at once
+META_FETCH_WORKERS = 4
+
+# Image proxy
+IMAGE_CACHE_DIR = f".cache/{DOMAIN}/images"
+IMAGE_CACHE_MAX_SIZE = 64 * 1024 * 1024
+# Larger source images are not proxied
+IMAGE_MAX_SIZE = 10 * 1024 * 1024
+# Width of the thumbnails served for each card image, in prefetch order
+IMAGE_WIDTHS = {
+    "poster": 342,
+    "fanart": 780,
+}
+# Images of new catalog items downloaded ahead of the first dashboard load
+IMAGE_PREFETCH_LIMIT = 20
+IMAGE_PREFETCH_WORKERS = 3
+
+# Catalog feeds
+CATALOG_FEED_URL = f"/api/{DOMAIN}/catalog/{{entity_id}}"
+# Pages of a catalog kept serialized, least recently requested dropped
+CATALOG_FEED_PAGES = 16
 
 # API
+API_TIMEOUT = 10
+# Requests that can be sent at once before the rate limit applies
+API_RATE_BURST = 10
+# Retries of a failed request, after 1, 2, 4... seconds
+API_RETRIES = 2
+API_RETRY_BACKOFF = 1.0
+# Failures in a row that stop requests to a host, and for how long (seconds)
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60
+CIRCUIT_MAX_RESET_TIMEOUT = 900
+# URLs with request statistics kept for diagnostics, least recently used dropped
+API_URL_STATS_MAX = 256
+# Upper bounds (seconds) of the duration histograms shown in diagnostics
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+API_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "DNT": "1",
+    "Referer": "https://web.stremio.com/",
+}
+CINEMETA_URL = "https://v3-cinemeta.strem.io"
+CINEMETA_MANIFEST_URL = f"{CINEMETA_URL}/manifest.json"
+CINEMETA_CATALOG = "top"
+CATALOG_PAGE_SIZE = 100
+STREAM_CHUNK_SIZE = 16384
+STREAM_DRAIN_LIMIT = 65536
+GENRE_INDEX_MAX_PAGES = 5
+# Catalogs refreshed at once, across every add-on
+MAX_CONCURRENT_REFRESHES = 8
 STREMIO_API_BASE_URL = {
     "movie": "https://v3-cinemeta.strem.io/catalog/movie/top",
     "series": "https://cinemeta-catalogs.strem.io/top/catalog/series/top",
@@ -85,6 +189,15 @@ GENRE_TRANSLATIONS = {
     "All": "Todos",
 }
 
+# Series status translations
+STATUS_TRANSLATIONS = {
+    "Continuing": "Em exibição",
+    "Returning Series": "Em exibição",
+    "In Production": "Em produção",
+    "Ended": "Finalizada",
+    "Canceled": "Cancelada",
+}
+
 # UI translations
 TRANSLATIONS = {
     "name": "Nome",
@@ -1,32 +1,721 @@
-"""DataUpdateCoordinator for integration_blueprint."""
+"""DataUpdateCoordinator for the Stremio integration."""
 
 from __future__ import annotations
 
+import asyncio
+import math
+import random
+import time
+from datetime import timedelta
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import (
-    IntegrationBlueprintApiClientAuthenticationError,
-    IntegrationBlueprintApiClientError,
+    StremioApiClient,
+    StremioApiClientError,
+    StremioDurationHistogram,
+    addon_catalog_url,
+    addon_url,
+    build_catalog_url,
 )
+from .const import (
+    ADAPTIVE_INTERVAL_GROWTH,
+    ADAPTIVE_INTERVAL_MAX,
+    ADAPTIVE_INTERVAL_MAX_FACTOR,
+    CATALOG_PAGE_SIZE,
+    CINEMETA_CATALOG,
+    CINEMETA_URL,
+    DATA_HUB,
+    DEFAULT_LIMIT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    GENRE_INDEX_MAX_PAGES,
+    LOGGER,
+    MAX_CONCURRENT_REFRESHES,
+    SCAN_INTERVAL_JITTER,
+    SCAN_INTERVAL_STAGGER,
+    STREMIO_API_BASE_URL,
+)
+from .data import StremioMeta
+from .store import StremioCatalogStore, StremioManifestStore, StremioMetaStore
 
 if TYPE_CHECKING:
-    from .data import IntegrationBlueprintConfigEntry
+    from collections.abc import Iterable
+
+    from .feed import StremioCatalogFeeds
+    from .image_proxy import StremioImageCache
+
+
+def catalog_base_url(
+    media_type: str,
+    manifest_url: str | None = None,
+    catalog_id: str = CINEMETA_CATALOG,
+) -> str:
+    """Return the base URL of an add-on catalog, by default Cinemeta's top one."""
+    if manifest_url and (
+        addon_url(manifest_url) != CINEMETA_URL or catalog_id != CINEMETA_CATALOG
+    ):
+        return addon_catalog_url(manifest_url, media_type, catalog_id)
+    return STREMIO_API_BASE_URL.get(media_type, STREMIO_API_BASE_URL["movie"])
+
+
+def meta_base_url(base_url: str) -> str:
+    """Return the URL of the add-on serving the metas of a catalog."""
+    if base_url in STREMIO_API_BASE_URL.values():
+        # The legacy series catalog is not served by Cinemeta itself
+        return CINEMETA_URL
+    return base_url.rpartition("/catalog/")[0]
+
+
+def catalog_url(base_url: str, genre: str | None = None) -> str:
+    """Return the URL of a catalog, filtered by an optional genre."""
+    return build_catalog_url(base_url, {"genre": genre or ""})
+
+
+class StremioGenreIndex:
+    """
+    Serve genre catalogs from one deep crawl of the unfiltered catalog.
+
+    The top catalog is paged until every subscribed genre has enough items or
+    ``GENRE_INDEX_MAX_PAGES`` is reached, and its metas are indexed by their
+    ``genre`` list. Genres the crawl left short of the limit, usually the rare
+    ones, are then requested on their own, so they show as many items as a
+    genre request would. Genre coordinators refreshing within ``max_age`` of
+    each other share the same crawl.
+    """
 
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: StremioApiClient,
+        base_url: str,
+        on_crawled: CALLBACK_TYPE,
+    ) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self.client = client
+        self.base_url = base_url
+        self.genres: set[str] = set()
+        self.limit = DEFAULT_LIMIT
+        self.max_age = DEFAULT_SCAN_INTERVAL / 2
+        self._index: dict[str, list[StremioMeta]] = {}
+        # Body bytes and metas read by the last crawl
+        self.payload_size = 0
+        self.items_decoded = 0
+        # Pages read by the last crawl, and the genres it left short
+        self.pages: int | None = None
+        self.short_genres: set[str] = set()
+        self._on_crawled = on_crawled
+        self._built: float | None = None
+        self._crawl: asyncio.Task[None] | None = None
 
-# https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class BlueprintDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+    async def async_get(self, genre: str) -> list[StremioMeta]:
+        """Return the items of a genre, crawling the catalog when stale."""
+        if (crawl := self._crawl) is None and (
+            self._built is None
+            or time.monotonic() - self._built > self.max_age.total_seconds()
+        ):
+            # Not started eagerly: a crawl served from the cache would finish,
+            # and clear _crawl, before the task is assigned to it
+            crawl = self._crawl = self.hass.async_create_task(
+                self._async_crawl(),
+                f"{DOMAIN} genre index {self.base_url}",
+                eager_start=False,
+            )
 
-    config_entry: IntegrationBlueprintConfigEntry
+        if crawl is not None:
+            await asyncio.shield(crawl)
+
+        return self._index.get(genre, [])
+
+    async def _async_crawl(self) -> None:
+        """Page through the unfiltered catalog and index it by genre."""
+        try:
+            index, crawled, size, decoded = await self._async_crawl_pages()
+
+            short = {
+                genre for genre in self.genres if len(index.get(genre, ())) < self.limit
+            }
+            fetched = await asyncio.gather(
+                *(self._async_fetch_genre(genre) for genre in short)
+            )
+            for genre, result in zip(short, fetched, strict=True):
+                if result is not None:
+                    index[genre], genre_size, genre_decoded = result
+                    size += genre_size
+                    decoded += genre_decoded
+        finally:
+            self._crawl = None
+
+        LOGGER.debug(
+            "Índice de gêneros do Stremio para %s montado com %s páginas "
+            "e %s gêneros requisitados à parte",
+            self.base_url,
+            crawled,
+            len(short),
+        )
+        self._index = index
+        self.payload_size = size
+        self.items_decoded = decoded
+        self.pages = crawled
+        self.short_genres = short
+        self._built = time.monotonic()
+        self._on_crawled()
+
+    async def _async_crawl_pages(
+        self,
+    ) -> tuple[dict[str, list[StremioMeta]], int, int, int]:
+        """Return the crawled metas by genre, and the pages, bytes and metas read."""
+        index: dict[str, list[StremioMeta]] = {}
+        crawled = size = decoded = 0
+        pages = self.client.async_iter_catalog(self.base_url)
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
         try:
-            return await self.config_entry.runtime_data.client.async_get_data()
-        except IntegrationBlueprintApiClientAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
-        except IntegrationBlueprintApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+            async for page in pages:
+                crawled += 1
+                size += page.size
+                decoded += page.count
+
+                for item in page.metas:
+                    for genre in item.genre:
+                        index.setdefault(genre, []).append(item)
+
+                if crawled >= GENRE_INDEX_MAX_PAGES or all(
+                    len(index.get(genre, ())) >= self.limit for genre in self.genres
+                ):
+                    break
+        finally:
+            await pages.aclose()
+
+        return index, crawled, size, decoded
+
+    async def _async_fetch_genre(
+        self, genre: str
+    ) -> tuple[list[StremioMeta], int, int] | None:
+        """Request a genre the crawl left short, keeping the crawl's items on error."""
+        items: list[StremioMeta] = []
+        size = decoded = 0
+        pages = self.client.async_iter_catalog(
+            self.base_url, {"genre": genre}, limit=self.limit
+        )
+
+        try:
+            async for page in pages:
+                items.extend(page.metas)
+                size += page.size
+                decoded += page.count
+                if len(items) >= self.limit:
+                    break
+        except StremioApiClientError as err:
+            LOGGER.warning(
+                "Erro obtendo o gênero %s do Stremio para o índice de %s: %s",
+                genre,
+                self.base_url,
+                err,
+            )
+            return None
+        finally:
+            await pages.aclose()
+
+        return items[: self.limit], size, decoded
+
+
+class StremioCatalogCoordinator(DataUpdateCoordinator[list[StremioMeta]]):
+    """
+    Fetch a single Stremio catalog on behalf of every subscribed sensor.
+
+    The coordinator polls at ``base_interval`` while its catalog changes. Each
+    refresh that returns the same items stretches the interval, up to
+    ``ADAPTIVE_INTERVAL_MAX_FACTOR`` times the base, and a change resets it.
+    Every interval is jittered, and the first one is staggered, so catalogs
+    sharing a scan interval do not wake up together.
+
+    Unlike coordinator listeners, refresh listeners are called after every
+    refresh, including those that leave the catalog unchanged, so diagnostic
+    entities can follow the cost and health of each refresh, and sensors the
+    age of a catalog kept while its refreshes fail.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        client: StremioApiClient,
+        media_type: str,
+        genre: str | None,
+        update_interval: timedelta,
+        *,
+        base_url: str,
+        refresh_semaphore: asyncio.Semaphore,
+        metas: StremioMetaStore,
+    ) -> None:
+        """Initialize the coordinator."""
+        url = catalog_url(base_url, genre)
+        super().__init__(
+            hass,
+            LOGGER,
+            config_entry=None,
+            name=f"{DOMAIN} {url}",
+            update_interval=update_interval,
+            always_update=False,
+        )
+        self.client = client
+        self.url = url
+        self.base_url = base_url
+        self.media_type = media_type
+        self.genre = genre
+        self.limit = DEFAULT_LIMIT
+        # Set when the genre is served from a crawl of the unfiltered catalog
+        self.genre_index: StremioGenreIndex | None = None
+        # True while the data comes from the on-disk snapshot
+        self.restored = False
+        # Wall clock time the data was fetched
+        self.fetched: float | None = None
+        self.base_interval = update_interval
+        # The adapted interval, before jitter
+        self._stable_interval = update_interval
+        # Durations of the refreshes, and of formatting the items for sensors
+        self.refresh_durations = StremioDurationHistogram()
+        self.format_durations = StremioDurationHistogram()
+        # Body bytes and metas read for the current data, before the limit
+        self.payload_size: int | None = None
+        self.items_decoded: int | None = None
+        self.consecutive_failures = 0
+        self._refresh_listeners: list[CALLBACK_TYPE] = []
+        # Set when a refresh confirms restored data, which listeners still show
+        # as stale although the base coordinator sees no change
+        self._restored_confirmed = False
+        # Shared by every coordinator, to bound the refreshes running at once
+        self._refresh_semaphore = refresh_semaphore
+        self._metas = metas
+        # Set by the hub when a subscriber shows series details
+        self.meta_details = False
+        self._async_set_next_interval(stagger=True)
+
+    @property
+    def staleness(self) -> float | None:
+        """Return the age of data kept from before a failed or pending refresh."""
+        if self.fetched is None or (self.last_update_success and not self.restored):
+            return None
+        return max(time.time() - self.fetched, 0.0)
+
+    @callback
+    def async_add_refresh_listener(self, listener: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call a listener after every refresh and return a function to remove it."""
+        self._refresh_listeners.append(listener)
+        return lambda: self._refresh_listeners.remove(listener)
+
+    @callback
+    def async_set_base_interval(self, interval: timedelta) -> None:
+        """Set the configured scan interval, resetting the adapted one."""
+        if interval == self.base_interval:
+            return
+        self.base_interval = self._stable_interval = interval
+        self._async_set_next_interval()
+
+    @callback
+    def _async_adapt_interval(self, *, changed: bool) -> None:
+        """Poll less often while the catalog is stable, as configured after a change."""
+        if changed:
+            self._stable_interval = self.base_interval
+        else:
+            self._stable_interval = min(
+                self._stable_interval * ADAPTIVE_INTERVAL_GROWTH,
+                self.base_interval * ADAPTIVE_INTERVAL_MAX_FACTOR,
+                max(ADAPTIVE_INTERVAL_MAX, self.base_interval),
+            )
+        self._async_set_next_interval()
+        LOGGER.debug(
+            "Próxima atualização do catálogo do Stremio %s em %s",
+            self.url,
+            self.update_interval,
+        )
+
+    @callback
+    def _async_set_next_interval(self, *, stagger: bool = False) -> None:
+        """Jitter the adapted interval into the next polling interval."""
+        low = 1 - (SCAN_INTERVAL_STAGGER if stagger else SCAN_INTERVAL_JITTER)
+        self.update_interval = self._stable_interval * random.uniform(  # noqa: S311
+            low, 1 + SCAN_INTERVAL_JITTER
+        )
+
+    async def _async_update_data(self) -> list[StremioMeta]:
+        """Fetch the catalog from Stremio API."""
+        async with self._refresh_semaphore:
+            start = time.perf_counter()
+            try:
+                # The hub may drop the index while its crawl runs
+                if (index := self.genre_index) is not None and self.genre:
+                    items = await index.async_get(self.genre)
+                    self.payload_size = index.payload_size
+                    self.items_decoded = index.items_decoded
+                else:
+                    items = await self._async_fetch_catalog()
+                if self.meta_details:
+                    items = await self._metas.async_enrich(
+                        meta_base_url(self.base_url), self.media_type, items
+                    )
+            except StremioApiClientError as exception:
+                self.consecutive_failures += 1
+                raise UpdateFailed(exception) from exception
+            else:
+                self.consecutive_failures = 0
+            finally:
+                self.refresh_durations.record(time.perf_counter() - start)
+
+        if not items:
+            LOGGER.error("Nenhum item válido no catálogo do Stremio: %s", self.url)
+
+        changed = items != self.data
+        self._async_adapt_interval(changed=changed)
+        self._restored_confirmed = (
+            self.restored and not changed and self.last_update_success
+        )
+        self.restored = False
+        self.fetched = time.time()
+        return items
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Call the refresh listeners once the refresh set the data and outcome."""
+        if self._restored_confirmed:
+            self._restored_confirmed = False
+            self.async_update_listeners()
+
+        for listener in list(self._refresh_listeners):
+            listener()
+
+    async def _async_fetch_catalog(self) -> list[StremioMeta]:
+        """Page through the catalog until enough valid items are collected."""
+        items: list[StremioMeta] = []
+        size = decoded = 0
+        pages = self.client.async_iter_catalog(
+            self.base_url,
+            {"genre": self.genre or ""},
+            limit=self.limit,
+        )
+
+        try:
+            async for page in pages:
+                items.extend(page.metas)
+                size += page.size
+                decoded += page.count
+                if len(items) >= self.limit:
+                    break
+        finally:
+            await pages.aclose()
+
+        self.payload_size = size
+        self.items_decoded = decoded
+        return items[: self.limit]
+
+
+class StremioHub:
+    """Share catalog coordinators between every Stremio config entry."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.client = StremioApiClient(async_get_clientsession(hass))
+        self.store = StremioCatalogStore(hass)
+        self.manifests = StremioManifestStore(hass, self.client)
+        self.metas = StremioMetaStore(hass, self.client, self.manifests)
+        self.coordinators: dict[str, StremioCatalogCoordinator] = {}
+        self._subscriptions: dict[str, dict[str, tuple[int, timedelta, bool]]] = {}
+        self._unsub_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._genre_indexes: dict[str, StremioGenreIndex] = {}
+        self._request_limits: dict[str, tuple[float, int]] = {}
+        self.images: StremioImageCache | None = None
+        self.feeds: StremioCatalogFeeds | None = None
+        self._refresh_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFRESHES)
+        self._setup_lock = asyncio.Lock()
+        self._setup_done = False
+
+    async def async_setup(self) -> None:
+        """Load the catalog snapshot, add-on manifests and title details once."""
+        async with self._setup_lock:
+            if not self._setup_done:
+                await asyncio.gather(
+                    self.store.async_load(),
+                    self.manifests.async_load(),
+                    self.metas.async_load(),
+                )
+                self._setup_done = True
+
+    async def async_get_image_cache(self) -> StremioImageCache:
+        """Return the image cache, serving it on first use."""
+        # Only entries with the image proxy need it
+        from .image_proxy import StremioImageCache, StremioImageView  # noqa: PLC0415
+
+        async with self._setup_lock:
+            if self.images is None:
+                images = StremioImageCache(self.hass)
+                await images.async_setup()
+                self.hass.http.register_view(StremioImageView(images))
+                self.images = images
+        return self.images
+
+    @callback
+    def async_get_catalog_feeds(self) -> StremioCatalogFeeds:
+        """Return the catalog feeds, serving them on first use."""
+        # Only lightweight entries need them
+        from homeassistant.components import websocket_api  # noqa: PLC0415
+
+        from .feed import (  # noqa: PLC0415
+            StremioCatalogFeeds,
+            StremioCatalogView,
+            websocket_catalog,
+        )
+
+        if self.feeds is None:
+            self.feeds = StremioCatalogFeeds()
+            self.hass.http.register_view(StremioCatalogView())
+            websocket_api.async_register_command(self.hass, websocket_catalog)
+        return self.feeds
+
+    async def async_refresh(
+        self, coordinators: Iterable[StremioCatalogCoordinator]
+    ) -> None:
+        """
+        Fetch catalogs without data and refresh restored ones in the background.
+
+        While Home Assistant starts, every refresh waits until it has started,
+        so setup does not wait on the network; sensors show their restored
+        state meanwhile.
+        """
+        coordinators = set(coordinators)
+
+        if self.hass.state is not CoreState.running:
+            async_at_started(
+                self.hass, partial(self._async_refresh_started, coordinators)
+            )
+            return
+
+        pending = []
+
+        for coordinator in coordinators:
+            if coordinator.data is None:
+                pending.append(coordinator.async_refresh())
+            elif coordinator.restored:
+                self._async_refresh_in_background(coordinator)
+
+        await asyncio.gather(*pending)
+
+    async def _async_refresh_started(
+        self,
+        coordinators: set[StremioCatalogCoordinator],
+        hass: HomeAssistant,  # noqa: ARG002
+    ) -> None:
+        """Refresh the catalogs of owners set up while Home Assistant started."""
+        for coordinator in coordinators:
+            # Skip catalogs nobody subscribes to any more
+            if self.coordinators.get(coordinator.url) is not coordinator:
+                continue
+            if coordinator.data is None or coordinator.restored:
+                self._async_refresh_in_background(coordinator)
+
+    @callback
+    def _async_refresh_in_background(
+        self, coordinator: StremioCatalogCoordinator
+    ) -> None:
+        """Refresh a catalog without waiting for it."""
+        self.hass.async_create_background_task(
+            coordinator.async_refresh(),
+            name=f"{DOMAIN} refresh {coordinator.url}",
+        )
+
+    @callback
+    def async_subscribe(  # noqa: PLR0913
+        self,
+        owner: str,
+        media_type: str,
+        genre: str | None,
+        limit: int,
+        scan_interval: timedelta,
+        base_url: str | None = None,
+        *,
+        meta_details: bool = False,
+    ) -> StremioCatalogCoordinator:
+        """Return the shared coordinator for a catalog, creating it if needed."""
+        base_url = base_url or catalog_base_url(media_type)
+        url = catalog_url(base_url, genre)
+
+        if (coordinator := self.coordinators.get(url)) is None:
+            coordinator = StremioCatalogCoordinator(
+                self.hass,
+                self.client,
+                media_type,
+                genre,
+                scan_interval,
+                base_url=base_url,
+                refresh_semaphore=self._refresh_semaphore,
+                metas=self.metas,
+            )
+            if (snapshot := self.store.async_get(url)) is not None:
+                coordinator.data, coordinator.fetched = snapshot
+                coordinator.restored = True
+            self.coordinators[url] = coordinator
+            self._unsub_listeners[url] = [
+                coordinator.async_add_listener(
+                    partial(self._async_catalog_updated, coordinator)
+                ),
+                coordinator.async_add_refresh_listener(
+                    partial(self._async_catalog_refreshed, coordinator)
+                ),
+            ]
+
+        self._subscriptions.setdefault(url, {})[owner] = (
+            limit,
+            scan_interval,
+            meta_details,
+        )
+        self._async_apply_subscriptions(url)
+        self._async_apply_genre_strategy(base_url)
+        return coordinator
+
+    @callback
+    def async_set_request_limits(
+        self, owner: str, rate_limit: float, max_concurrent_requests: int
+    ) -> None:
+        """Set the request limits of an owner."""
+        self._request_limits[owner] = (rate_limit, max_concurrent_requests)
+        self._async_apply_request_limits()
+
+    async def async_unsubscribe(self, owner: str) -> None:
+        """Drop every subscription of an owner and stop unused coordinators."""
+        if self._request_limits.pop(owner, None) is not None:
+            self._async_apply_request_limits()
+
+        base_urls = set()
+
+        for url in list(self._subscriptions):
+            owners = self._subscriptions[url]
+            if owners.pop(owner, None) is None:
+                continue
+
+            base_urls.add(self.coordinators[url].base_url)
+            if owners:
+                self._async_apply_subscriptions(url)
+                continue
+
+            del self._subscriptions[url]
+            for unsub in self._unsub_listeners.pop(url):
+                unsub()
+            self.client.forget(url)
+            await self.coordinators.pop(url).async_shutdown()
+
+        for base_url in base_urls:
+            self._async_apply_genre_strategy(base_url)
+
+    @callback
+    def _async_catalog_updated(self, coordinator: StremioCatalogCoordinator) -> None:
+        """Save a changed catalog to the snapshot."""
+        if coordinator.last_update_success and coordinator.data and coordinator.fetched:
+            self.store.async_update(
+                coordinator.url,
+                coordinator.data[: coordinator.limit],
+                coordinator.fetched,
+            )
+
+    @callback
+    def _async_catalog_refreshed(self, coordinator: StremioCatalogCoordinator) -> None:
+        """Record in the snapshot when a catalog was last fetched, changed or not."""
+        if coordinator.last_update_success and coordinator.fetched:
+            self.store.async_touch(coordinator.url, coordinator.fetched)
+
+    @callback
+    def _async_apply_subscriptions(self, url: str) -> None:
+        """Size a coordinator for the most demanding of its subscribers."""
+        coordinator = self.coordinators[url]
+        owners = self._subscriptions[url].values()
+        coordinator.limit = max(limit for limit, _, _ in owners)
+        coordinator.async_set_base_interval(min(interval for _, interval, _ in owners))
+        # Only series show episode and season counts and a status
+        coordinator.meta_details = coordinator.media_type == "series" and any(
+            details for _, _, details in owners
+        )
+
+    @callback
+    def _async_apply_request_limits(self) -> None:
+        """Limit the client to the most restrictive owner."""
+        limits = self._request_limits.values()
+        self.client.set_limits(
+            min((rate for rate, _ in limits), default=DEFAULT_RATE_LIMIT),
+            min(
+                (concurrent for _, concurrent in limits),
+                default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+            ),
+        )
+
+    @callback
+    def _async_apply_genre_strategy(self, base_url: str) -> None:
+        """Choose between genre requests and a crawl plus local genre index."""
+        if base_url not in STREMIO_API_BASE_URL.values():
+            return
+
+        coordinators = [
+            coordinator
+            for coordinator in self.coordinators.values()
+            if coordinator.base_url == base_url and coordinator.genre
+        ]
+        if not coordinators:
+            self._genre_indexes.pop(base_url, None)
+            return
+
+        limit = max(coordinator.limit for coordinator in coordinators)
+        genres = {coordinator.genre for coordinator in coordinators}
+        pages_per_genre = math.ceil(limit / CATALOG_PAGE_SIZE)
+
+        # Kept while genre requests are chosen, to remember the last crawl
+        if (index := self._genre_indexes.get(base_url)) is None:
+            index = self._genre_indexes[base_url] = StremioGenreIndex(
+                self.hass,
+                self.client,
+                base_url,
+                partial(self._async_apply_genre_strategy, base_url),
+            )
+        index.genres = genres
+        index.limit = limit
+        index.max_age = (
+            min(coordinator.base_interval for coordinator in coordinators) / 2
+        )
+
+        # Genres the last crawl left short are requested on their own as well
+        index_requests = (
+            GENRE_INDEX_MAX_PAGES if index.pages is None else index.pages
+        ) + len(index.short_genres & genres) * pages_per_genre
+        if len(coordinators) * pages_per_genre <= index_requests:
+            index = None
+
+        LOGGER.debug(
+            "Catálogos de %s por gênero servidos %s",
+            base_url,
+            "pelo índice local" if index else "por requisições por gênero",
+        )
+        for coordinator in coordinators:
+            coordinator.genre_index = index
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> StremioHub:
+    """Return the Stremio hub shared by every config entry."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+
+    if (hub := domain_data.get(DATA_HUB)) is None:
+        hub = domain_data[DATA_HUB] = StremioHub(hass)
+    return hub
+
+
+def scan_interval_from_config(value: Any) -> timedelta:
+    """Normalize a scan interval stored as seconds or a timedelta."""
+    if isinstance(value, timedelta):
+        return value
+    if value is None:
+        return DEFAULT_SCAN_INTERVAL
+    return timedelta(seconds=float(value))
@@ -1,25 +1,133 @@
-"""Custom types for integration_blueprint."""
+"""Custom types for the Stremio integration."""
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.loader import Integration
 
-    from .api import IntegrationBlueprintApiClient
-    from .coordinator import BlueprintDataUpdateCoordinator
+    from .coordinator import StremioCatalogCoordinator, StremioHub
 
 
-type IntegrationBlueprintConfigEntry = ConfigEntry[IntegrationBlueprintData]
+type StremioConfigEntry = ConfigEntry[StremioData]
 
 
 @dataclass
-class IntegrationBlueprintData:
-    """Data for the Blueprint integration."""
+class StremioData:
+    """Runtime data for a Stremio config entry."""
 
-    client: IntegrationBlueprintApiClient
-    coordinator: BlueprintDataUpdateCoordinator
-    integration: Integration
+    hub: StremioHub
+    coordinators: dict[str | None, StremioCatalogCoordinator]
+
+
+def _split_url(url: Any) -> tuple[str, str]:
+    """Split an image URL before its last two segments, interning the head."""
+    if not url:
+        return "", ""
+
+    url = str(url)
+    if not url.startswith(("http:", "https:")):
+        url = f"https:{url}"
+
+    cut = url.rfind("/", 0, url.rfind("/")) + 1
+    return sys.intern(url[:cut]), url[cut:]
+
+
+def _scalar(value: Any) -> Any:
+    """Return a JSON scalar as is and anything else as a string."""
+    if value is None or isinstance(value, str | int | float):
+        return value
+    return str(value)
+
+
+def _names(value: Any) -> tuple[str, ...]:
+    """Return a list field as a tuple of interned strings."""
+    if not isinstance(value, list):
+        return (sys.intern(str(value)),) if value else ()
+    return tuple(sys.intern(str(name)) for name in value)
+
+
+@dataclass(slots=True, frozen=True)
+class StremioMeta:
+    """
+    The fields of a Cinemeta meta that the sensors show.
+
+    Metas are projected onto this model while a catalog is decoded, so the
+    full payload (videos, trailers, links...) never outlives the decode.
+    Strings shared between items, such as genre and director names and image
+    URL prefixes, are interned. Every field holds a hashable value, so items
+    can key caches by content.
+    """
+
+    id: str
+    name: str
+    poster_base: str = ""
+    poster_path: str = ""
+    background_base: str = ""
+    background_path: str = ""
+    director: tuple[str, ...] | None = None
+    genre: tuple[str, ...] = ()
+    imdb_rating: Any = None
+    runtime: Any = None
+    description: str = ""
+    episode_count: Any = None
+    season_count: Any = None
+    status: Any = None
+
+    @classmethod
+    def from_meta(cls, meta: Any) -> StremioMeta | None:
+        """Project a catalog meta, or return None if it cannot be shown."""
+        if not isinstance(meta, dict) or not meta.get("id") or not meta.get("name"):
+            return None
+
+        poster_base, poster_path = _split_url(meta.get("poster"))
+        background_base, background_path = _split_url(meta.get("background"))
+        director = meta.get("director")
+
+        return cls(
+            id=str(meta["id"]),
+            name=str(meta["name"]),
+            poster_base=poster_base,
+            poster_path=poster_path,
+            background_base=background_base,
+            background_path=background_path,
+            director=_names(director) if director else None,
+            genre=_names(meta.get("genre")),
+            imdb_rating=_scalar(meta.get("imdbRating")),
+            runtime=_scalar(meta.get("runtime")),
+            description=str(meta.get("description") or ""),
+            episode_count=_scalar(meta.get("episodeCount")),
+            season_count=_scalar(meta.get("seasonCount")),
+            status=_scalar(meta.get("status")),
+        )
+
+    @property
+    def poster(self) -> str:
+        """Return the poster URL."""
+        return self.poster_base + self.poster_path
+
+    @property
+    def background(self) -> str:
+        """Return the background URL."""
+        return self.background_base + self.background_path
+
+    def to_meta(self) -> dict[str, Any]:
+        """Return the model as a Cinemeta meta, without empty fields."""
+        meta = {
+            "id": self.id,
+            "name": self.name,
+            "poster": self.poster,
+            "background": self.background,
+            "director": list(self.director) if self.director is not None else None,
+            "genre": list(self.genre),
+            "imdbRating": self.imdb_rating,
+            "runtime": self.runtime,
+            "description": self.description,
+            "episodeCount": self.episode_count,
+            "seasonCount": self.season_count,
+            "status": self.status,
+        }
+        return {key: value for key, value in meta.items() if value not in (None, "")}
@@ -0,0 +1,147 @@
+"""Diagnostics support for Stremio."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit, urlunsplit
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_MANIFEST_URL
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .api import StremioUrlStats
+    from .coordinator import StremioCatalogCoordinator
+    from .data import StremioConfigEntry
+
+TO_REDACT = {CONF_MANIFEST_URL}
+
+# Add-ons often keep user settings and API keys in the path before these
+_RESOURCE_PATH = re.compile(r"/(?:(?:catalog|meta|stream|subtitles)/|manifest\.json$)")
+_URL = re.compile(r"https?://[^\s'\"<>]+")
+
+
+def _redact_url(url: str) -> str:
+    """Return a URL with its add-on path hashed, and credentials and query dropped."""
+    parts = urlsplit(url)
+    path = parts.path
+    if (match := _RESOURCE_PATH.search(path)) is not None:
+        prefix, resource = path[: match.start()], path[match.start() :]
+    else:
+        prefix, resource = path, ""
+    if prefix.strip("/"):
+        prefix = "/" + hashlib.sha256(prefix.encode()).hexdigest()[:12]
+    return urlunsplit(
+        (parts.scheme, parts.netloc.rpartition("@")[2], prefix + resource, "", "")
+    )
+
+
+def _redact_text(text: str | None) -> str | None:
+    """Return an error message with the URLs it mentions redacted."""
+    if text is None:
+        return None
+    return _URL.sub(lambda match: _redact_url(match[0]), text)
+
+
+def _url_diagnostics(stats: StremioUrlStats) -> dict[str, Any]:
+    """Return the statistics of a URL."""
+    return {
+        "requests": stats.requests,
+        "errors": stats.errors,
+        "bytes_received": stats.bytes_received,
+        "latency": stats.latency.as_dict(),
+        "decode": stats.decode.as_dict(),
+        "last_error": _redact_text(stats.last_error),
+        "last_error_at": (
+            None
+            if stats.last_error_at is None
+            else dt_util.utc_from_timestamp(stats.last_error_at).isoformat()
+        ),
+    }
+
+
+def _catalog_diagnostics(coordinator: StremioCatalogCoordinator) -> dict[str, Any]:
+    """Return the state and timings of a catalog coordinator."""
+    return {
+        "url": _redact_url(coordinator.url),
+        "items": None if coordinator.data is None else len(coordinator.data),
+        "limit": coordinator.limit,
+        "genre_index": coordinator.genre_index is not None,
+        "meta_details": coordinator.meta_details,
+        "restored": coordinator.restored,
+        "last_update_success": coordinator.last_update_success,
+        "last_exception": (
+            None
+            if coordinator.last_exception is None
+            else _redact_text(str(coordinator.last_exception))
+        ),
+        "staleness": coordinator.staleness,
+        "base_interval": coordinator.base_interval.total_seconds(),
+        "update_interval": (
+            None
+            if coordinator.update_interval is None
+            else coordinator.update_interval.total_seconds()
+        ),
+        "refresh": coordinator.refresh_durations.as_dict(),
+        "format": coordinator.format_durations.as_dict(),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: StremioConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hub = entry.runtime_data.hub
+    client = hub.client
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "catalogs": {
+            genre or "all": _catalog_diagnostics(coordinator)
+            for genre, coordinator in entry.runtime_data.coordinators.items()
+        },
+        # The client is shared by every entry
+        "client": {
+            "requests": {
+                **asdict(client.request_stats),
+                "queue_wait_avg": client.request_stats.queue_wait_avg,
+            },
+            "cache": {
+                **asdict(client.cache_stats),
+                "hit_ratio": client.cache_stats.hit_ratio,
+            },
+            "circuits": {
+                host.rpartition("@")[2]: circuit
+                for host, circuit in client.circuit_stats().items()
+            },
+            "urls": {
+                _redact_url(url): _url_diagnostics(stats)
+                for url, stats in client.url_stats.items()
+            },
+        },
+    }
+
+    diagnostics["meta_details"] = {
+        **asdict(hub.metas.stats),
+        "titles": len(hub.metas),
+    }
+
+    if hub.images is not None:
+        diagnostics["image_prefetch"] = {
+            owner: asdict(progress)
+            for owner, progress in hub.images.prefetch_progress.items()
+            if owner.startswith(entry.entry_id)
+        }
+
+    return diagnostics
@@ -1,28 +1,88 @@
-"""BlueprintEntity class."""
+"""Base entity for the Stremio integration."""
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION
-from .coordinator import BlueprintDataUpdateCoordinator
+from .const import DOMAIN, MEDIA_TYPES
+from .coordinator import StremioCatalogCoordinator
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.entity import EntityDescription
+
 
+def stremio_device_info(entry_id: str, media_type: str) -> DeviceInfo:
+    """Return the device of a config entry."""
+    # Set standard device name based on media type
+    media_type_name = MEDIA_TYPES.get(media_type, media_type.capitalize())
+    device_name = f"Stremio {media_type_name}"
 
-class IntegrationBlueprintEntity(CoordinatorEntity[BlueprintDataUpdateCoordinator]):
-    """BlueprintEntity class."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{entry_id}_{media_type}")},
+        name=device_name,
+        manufacturer="Stremio",
+        model="Integration",
+    )
 
-    _attr_attribution = ATTRIBUTION
 
-    def __init__(self, coordinator: BlueprintDataUpdateCoordinator) -> None:
-        """Initialize."""
+class StremioEntity(CoordinatorEntity[StremioCatalogCoordinator]):
+    """Base class for entities fed by a shared Stremio catalog coordinator."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: StremioCatalogCoordinator,
+        entry_id: str | None,
+        media_type: str,
+    ) -> None:
+        """Initialize the entity."""
         super().__init__(coordinator)
-        self._attr_unique_id = coordinator.config_entry.entry_id
-        self._attr_device_info = DeviceInfo(
-            identifiers={
-                (
-                    coordinator.config_entry.domain,
-                    coordinator.config_entry.entry_id,
-                ),
-            },
-        )
+        self._entry_id = entry_id
+        self._media_type = media_type
+
+    @property
+    def device_info(self) -> DeviceInfo | None:
+        """Return device information about this Stremio instance."""
+        if not self._entry_id:
+            return None
+        return stremio_device_info(self._entry_id, self._media_type)
+
+
+class StremioEntryEntity(Entity):
+    """
+    Base class for diagnostic entities fed by every catalog of a config entry.
+
+    The state is written after each refresh of any of the catalogs, whether or
+    not the refresh changed the catalog.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinators: list[StremioCatalogCoordinator],
+        entry_id: str,
+        media_type: str,
+        entity_description: EntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        self.coordinators = coordinators
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{entry_id}_{media_type}_{entity_description.key}"
+        self._attr_device_info = stremio_device_info(entry_id, media_type)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the refreshes of the catalogs."""
+        await super().async_added_to_hass()
+        for coordinator in self.coordinators:
+            self.async_on_remove(
+                coordinator.async_add_refresh_listener(self.async_write_ha_state)
+            )
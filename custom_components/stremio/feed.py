@@ -0,0 +1,191 @@
+"""Pre-serialized catalogs of the Stremio sensors, over HTTP and websocket."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from aiohttp import web
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.components import websocket_api
+from homeassistant.components.http import KEY_HASS, KEY_HASS_USER, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import Unauthorized
+from homeassistant.helpers.json import json_bytes
+
+from .const import CATALOG_FEED_PAGES, CATALOG_FEED_URL, DATA_HUB, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.auth.models import User
+
+
+class StremioCatalogFeed:
+    """
+    The card entries of a sensor, serialized once per catalog change.
+
+    Every entry is serialized when the feed is built, along with the whole
+    document and its gzip compression. A page only joins the bytes of its
+    entries; the last ``CATALOG_FEED_PAGES`` pages requested are kept, since
+    dashboards ask for the same page on every load.
+    """
+
+    def __init__(self, items: list[dict[str, Any]]) -> None:
+        """Serialize the entries of a catalog."""
+        self._items = [json_bytes(item) for item in items]
+        self.version = hashlib.blake2b(
+            b"\n".join(self._items), digest_size=8
+        ).hexdigest()
+        self._pages: OrderedDict[tuple[int, int | None], tuple[bytes, bytes]] = (
+            OrderedDict()
+        )
+        self.page(0, None)
+
+    @property
+    def count(self) -> int:
+        """Return the number of entries."""
+        return len(self._items)
+
+    def etag(self, offset: int, limit: int | None) -> str:
+        """Return the entity tag of a page."""
+        return f'"{self.version}-{offset}-{limit or ""}"'
+
+    def page(self, offset: int, limit: int | None) -> tuple[bytes, bytes]:
+        """Return a page as a JSON document, plain and gzip compressed."""
+        key = (offset, limit)
+        if (page := self._pages.get(key)) is not None:
+            self._pages.move_to_end(key)
+            return page
+
+        end = None if limit is None else offset + limit
+        document = b"".join(
+            (
+                b'{"version":"',
+                self.version.encode(),
+                b'","count":',
+                str(self.count).encode(),
+                b',"offset":',
+                str(offset).encode(),
+                b',"data":[',
+                b",".join(self._items[offset:end]),
+                b"]}",
+            )
+        )
+        page = self._pages[key] = (document, gzip.compress(document, mtime=0))
+        if len(self._pages) > CATALOG_FEED_PAGES:
+            self._pages.popitem(last=False)
+        return page
+
+
+class StremioCatalogFeeds:
+    """The catalog feeds of the sensors, by entity id."""
+
+    def __init__(self) -> None:
+        """Initialize the feeds."""
+        self._feeds: dict[str, StremioCatalogFeed] = {}
+
+    @callback
+    def async_get(self, entity_id: str) -> StremioCatalogFeed | None:
+        """Return the feed of a sensor."""
+        return self._feeds.get(entity_id)
+
+    @callback
+    def async_update(
+        self, entity_id: str, items: list[dict[str, Any]]
+    ) -> StremioCatalogFeed:
+        """Serialize the new card entries of a sensor."""
+        feed = self._feeds[entity_id] = StremioCatalogFeed(items)
+        return feed
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Drop the feed of a removed sensor."""
+        self._feeds.pop(entity_id, None)
+
+
+def _get_feed(
+    hass: HomeAssistant, user: User, entity_id: str
+) -> StremioCatalogFeed | None:
+    """Return the feed of a sensor the user can read."""
+    if not user.permissions.check_entity(entity_id, POLICY_READ):
+        raise Unauthorized(entity_id=entity_id)
+
+    hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+    if hub is None or hub.feeds is None:
+        return None
+    return hub.feeds.async_get(entity_id)
+
+
+class StremioCatalogView(HomeAssistantView):
+    """
+    Serve the catalog of a sensor, optionally a page of it.
+
+    ``offset`` and ``limit`` query parameters select a page. Clients that
+    accept gzip get the compressed bytes as they were built, and a matching
+    ``If-None-Match`` gets ``304 Not Modified``.
+    """
+
+    url = CATALOG_FEED_URL
+    name = f"api:{DOMAIN}:catalog"
+
+    async def get(self, request: web.Request, entity_id: str) -> web.Response:
+        """Return a page of the catalog."""
+        hass = request.app[KEY_HASS]
+        try:
+            offset = int(request.query.get("offset", 0))
+            limit = int(request.query["limit"]) if "limit" in request.query else None
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        if offset < 0 or (limit is not None and limit < 1):
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+        if (feed := _get_feed(hass, request[KEY_HASS_USER], entity_id)) is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        etag = feed.etag(offset, limit)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        document, compressed = feed.page(offset, limit)
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            document = compressed
+
+        return web.Response(
+            body=document, content_type="application/json", headers=headers
+        )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/catalog",
+        vol.Required("entity_id"): str,
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_catalog(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return a page of the catalog of a sensor."""
+    if (feed := _get_feed(hass, connection.user, msg["entity_id"])) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Catalog not found"
+        )
+        return
+
+    document, _ = feed.page(msg["offset"], msg.get("limit"))
+    connection.send_message(
+        websocket_api.messages.construct_result_message(msg["id"], document)
+    )
@@ -0,0 +1,326 @@
+"""Local cache and thumbnail proxy for Stremio posters and backgrounds."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+
+import aiohttp
+import async_timeout
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    API_TIMEOUT,
+    DOMAIN,
+    IMAGE_CACHE_DIR,
+    IMAGE_CACHE_MAX_SIZE,
+    IMAGE_MAX_SIZE,
+    IMAGE_PREFETCH_WORKERS,
+    IMAGE_WIDTHS,
+    LOGGER,
+)
+
+IMAGE_PROXY_URL = f"/api/{DOMAIN}/image/{{kind}}/{{key}}"
+
+
+def _image_key(url: str) -> str:
+    """Return the proxy key of an image URL."""
+    return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+
+@dataclass
+class StremioPrefetchProgress:
+    """Progress of a prefetch run."""
+
+    total: int
+    done: int = 0
+    failed: int = 0
+    # Seconds the run took, once it ended
+    duration: float | None = None
+    cancelled: bool = False
+
+
+def _thumbnail(data: bytes, width: int) -> bytes:
+    """Return the image scaled down to a width, as JPEG, or unchanged."""
+    try:
+        from PIL import Image  # noqa: PLC0415
+    except ImportError:
+        return data
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width <= width:
+                return data
+            image.thumbnail((width, image.height * width // image.width + 1))
+            output = io.BytesIO()
+            image.convert("RGB").save(output, "JPEG", quality=85, optimize=True)
+    except (OSError, ValueError) as err:
+        LOGGER.debug("Não foi possível redimensionar imagem do Stremio: %s", err)
+        return data
+
+    return output.getvalue()
+
+
+def _content_type(data: bytes) -> str:
+    """Guess the content type of an image from its first bytes."""
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+class StremioImageCache:
+    """
+    Fetch images once, scale them down, and keep them on disk.
+
+    Only URLs registered by the sensors are served, under a key derived from
+    the URL, so the proxy cannot be used to fetch arbitrary addresses. A URL
+    is registered once per owner of a title showing it, and forgotten when no
+    owner does any more. Cached thumbnails are evicted least recently used
+    first once they take more than ``IMAGE_CACHE_MAX_SIZE`` bytes.
+
+    Images of new catalog items can be prefetched by a small pool of workers,
+    highest ranked items first. Each owner has at most one prefetch run; a
+    new run cancels the previous one.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._directory = Path(hass.config.path(IMAGE_CACHE_DIR))
+        self._sources: dict[str, str] = {}
+        self._source_refs: Counter[str] = Counter()
+        # Cached file names and sizes, least recently used first
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._fetches: dict[str, asyncio.Task[bytes | None]] = {}
+        self._prefetches: dict[str, asyncio.Task[None]] = {}
+        self.prefetch_progress: dict[str, StremioPrefetchProgress] = {}
+
+    async def async_setup(self) -> None:
+        """Index the images already on disk."""
+        files = await self.hass.async_add_executor_job(self._scan)
+        self._files = OrderedDict(files)
+        self._size = sum(self._files.values())
+
+    def _scan(self) -> list[tuple[str, int]]:
+        """Return the cached files and sizes, oldest first."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        entries = [
+            (entry.name, entry.stat())
+            for entry in os.scandir(self._directory)
+            if entry.is_file()
+        ]
+        entries.sort(key=lambda entry: entry[1].st_mtime)
+        return [(name, stat.st_size) for name, stat in entries]
+
+    @staticmethod
+    def proxy_url(url: str, kind: str) -> str:
+        """Return the proxy URL of an image URL."""
+        return IMAGE_PROXY_URL.format(kind=kind, key=_image_key(url))
+
+    @callback
+    def async_register(self, url: str, kind: str) -> str:
+        """Allow an image URL to be served and return its proxy URL."""
+        key = _image_key(url)
+        self._sources[key] = url
+        self._source_refs[key] += 1
+        return self.proxy_url(url, kind)
+
+    @callback
+    def async_unregister(self, url: str) -> None:
+        """Drop a registration of an image URL, forgetting it after the last one."""
+        key = _image_key(url)
+        self._source_refs[key] -= 1
+        if self._source_refs[key] <= 0:
+            del self._source_refs[key]
+            self._sources.pop(key, None)
+
+    async def async_get(self, kind: str, key: str) -> bytes | None:
+        """Return the thumbnail of a registered image."""
+        if kind not in IMAGE_WIDTHS or key not in self._sources:
+            return None
+
+        name = f"{kind}-{key}.jpg"
+        if name in self._files:
+            self._files.move_to_end(name)
+            data = await self.hass.async_add_executor_job(self._read, name)
+            if data is not None:
+                return data
+            self._forget(name)
+
+        return await self._async_fetch_shared(name, key, kind)
+
+    async def _async_fetch_shared(self, name: str, key: str, kind: str) -> bytes | None:
+        """Fetch an image, joining a download already in progress."""
+        if (fetch := self._fetches.get(name)) is None:
+            fetch = self._fetches[name] = self.hass.async_create_task(
+                self._async_fetch(name, self._sources[key], IMAGE_WIDTHS[kind]),
+                f"{DOMAIN} image {name}",
+            )
+            fetch.add_done_callback(lambda _: self._fetches.pop(name, None))
+        return await asyncio.shield(fetch)
+
+    @callback
+    def async_prefetch(self, owner: str, images: list[tuple[str, str]]) -> None:
+        """Download ``(kind, url)`` images in the background, in list order."""
+        if (previous := self._prefetches.pop(owner, None)) is not None:
+            previous.cancel()
+
+        jobs = [
+            (rank, kind, _image_key(url))
+            for rank, (kind, url) in enumerate(images)
+            if kind in IMAGE_WIDTHS
+            and f"{kind}-{_image_key(url)}.jpg" not in self._files
+        ]
+        if not jobs:
+            return
+
+        progress = self.prefetch_progress[owner] = StremioPrefetchProgress(len(jobs))
+        task = self._prefetches[owner] = self.hass.async_create_background_task(
+            self._async_prefetch(jobs, progress), f"{DOMAIN} image prefetch {owner}"
+        )
+        task.add_done_callback(
+            lambda done: self._prefetches.pop(owner, None)
+            if self._prefetches.get(owner) is done
+            else None
+        )
+
+    async def _async_prefetch(
+        self, jobs: list[tuple[int, str, str]], progress: StremioPrefetchProgress
+    ) -> None:
+        """Run a pool of workers over the prefetch jobs, by rank."""
+        queue: asyncio.PriorityQueue[tuple[int, str, str]] = asyncio.PriorityQueue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        async def worker() -> None:
+            while not queue.empty():
+                _, kind, key = queue.get_nowait()
+                name = f"{kind}-{key}.jpg"
+                if key in self._sources and (
+                    name in self._files
+                    or await self._async_fetch_shared(name, key, kind) is not None
+                ):
+                    progress.done += 1
+                else:
+                    progress.failed += 1
+
+        start = time.monotonic()
+        try:
+            await asyncio.gather(
+                *(worker() for _ in range(min(IMAGE_PREFETCH_WORKERS, len(jobs))))
+            )
+        except asyncio.CancelledError:
+            progress.cancelled = True
+            raise
+        finally:
+            progress.duration = time.monotonic() - start
+            LOGGER.debug(
+                "Pré-carregamento de imagens do Stremio: %s de %s em %.1f segundos",
+                progress.done,
+                progress.total,
+                progress.duration,
+            )
+
+    async def _async_fetch(self, name: str, url: str, width: int) -> bytes | None:
+        """Download an image, scale it down and store it."""
+        LOGGER.debug("Baixando imagem do Stremio: %s", url)
+        session = async_get_clientsession(self.hass)
+
+        try:
+            async with (
+                async_timeout.timeout(API_TIMEOUT),
+                session.get(url) as response,
+            ):
+                response.raise_for_status()
+                if (response.content_length or 0) > IMAGE_MAX_SIZE:
+                    return None
+                data = await response.content.read(IMAGE_MAX_SIZE + 1)
+        except (TimeoutError, aiohttp.ClientError) as err:
+            LOGGER.debug("Erro baixando imagem do Stremio %s: %s", url, err)
+            return None
+
+        if len(data) > IMAGE_MAX_SIZE:
+            return None
+
+        data = await self.hass.async_add_executor_job(_thumbnail, data, width)
+        evicted = self._add(name, len(data))
+        await self.hass.async_add_executor_job(self._write, name, data, evicted)
+        return data
+
+    def _add(self, name: str, size: int) -> list[str]:
+        """Account for a new file and return the files to evict."""
+        self._forget(name)
+        self._files[name] = size
+        self._size += size
+
+        evicted = []
+        while self._size > IMAGE_CACHE_MAX_SIZE and len(self._files) > 1:
+            oldest, oldest_size = self._files.popitem(last=False)
+            self._size -= oldest_size
+            evicted.append(oldest)
+        return evicted
+
+    def _forget(self, name: str) -> None:
+        """Stop accounting for a file."""
+        if (size := self._files.pop(name, None)) is not None:
+            self._size -= size
+
+    def _read(self, name: str) -> bytes | None:
+        """Read a cached file."""
+        try:
+            return (self._directory / name).read_bytes()
+        except OSError:
+            return None
+
+    def _write(self, name: str, data: bytes, evicted: list[str]) -> None:
+        """Store a file and delete the evicted ones."""
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            (self._directory / name).write_bytes(data)
+            for old in evicted:
+                (self._directory / old).unlink(missing_ok=True)
+        except OSError as err:
+            LOGGER.warning("Erro gravando cache de imagens do Stremio: %s", err)
+
+
+class StremioImageView(HomeAssistantView):
+    """
+    Serve cached thumbnails of Stremio images.
+
+    Browsers load the images from ``<img>`` tags, which cannot carry Home
+    Assistant credentials, so the view does not require authentication; it
+    only serves images registered by the sensors.
+    """
+
+    url = IMAGE_PROXY_URL
+    name = f"api:{DOMAIN}:image"
+    requires_auth = False
+
+    def __init__(self, cache: StremioImageCache) -> None:
+        """Initialize the view."""
+        self._cache = cache
+
+    async def get(self, request: web.Request, kind: str, key: str) -> web.Response:  # noqa: ARG002
+        """Return a thumbnail."""
+        if (data := await self._cache.async_get(kind, key)) is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        return web.Response(
+            body=data,
+            content_type=_content_type(data),
+            # The key is derived from the source URL, so the content never changes
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+        )
@@ -3,26 +3,44 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
-import aiohttp
-import async_timeout
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from homeassistant.components.sensor import PLATFORM_SCHEMA, SensorEntity
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.sensor import (
+    PLATFORM_SCHEMA,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    CONF_NAME,
+    CONF_SCAN_INTERVAL,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.util import dt as dt_util
 
 from .const import (
     AVAILABLE_GENRES,
+    CATALOG_FEED_URL,
     CONF_GENRES,
+    CONF_IMAGE_PROXY,
+    CONF_LIGHTWEIGHT,
     CONF_LIMIT,
     CONF_MEDIA_TYPE,
+    DATA_ITEM_STORES,
     DEFAULT_GENRES,
     DEFAULT_LIMIT,
     DEFAULT_MEDIA_TYPE,
@@ -30,13 +48,40 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     GENRE_TRANSLATIONS,
+    IMAGE_PREFETCH_LIMIT,
     LOGGER,
     MEDIA_TYPES,
-    STREMIO_API_BASE_URL,
+    STATUS_TRANSLATIONS,
 )
+from .coordinator import async_get_hub, scan_interval_from_config
+from .entity import StremioEntity, StremioEntryEntity
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from .coordinator import StremioCatalogCoordinator, StremioGenreIndex
+    from .data import StremioConfigEntry, StremioMeta
+    from .feed import StremioCatalogFeeds
+    from .image_proxy import StremioImageCache
 
 _LOGGER = logging.getLogger(__name__)
 
+# Attributes of a restored state the sensor sets itself
+RESTORED_ATTRIBUTES = frozenset(
+    {
+        "data",
+        "media_type",
+        "count",
+        "genre",
+        "genre_name",
+        "staleness",
+        "version",
+        "catalog_url",
+    }
+)
+
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
@@ -52,6 +97,129 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 )
 
 
+def _payload_sources(
+    coordinators: list[StremioCatalogCoordinator],
+) -> list[StremioCatalogCoordinator | StremioGenreIndex]:
+    """Return what fetched the catalogs, counting a shared genre crawl once."""
+    sources: dict[int, StremioCatalogCoordinator | StremioGenreIndex] = {}
+    for coordinator in coordinators:
+        source = coordinator.genre_index if coordinator.genre else None
+        source = source or coordinator
+        sources[id(source)] = source
+    return list(sources.values())
+
+
+def _refresh_duration(coordinators: list[StremioCatalogCoordinator]) -> float | None:
+    """Return the longest last refresh of the catalogs, in milliseconds."""
+    durations = [
+        coordinator.refresh_durations.last
+        for coordinator in coordinators
+        if coordinator.refresh_durations.last is not None
+    ]
+    return round(max(durations) * 1000, 1) if durations else None
+
+
+def _payload_size(coordinators: list[StremioCatalogCoordinator]) -> int | None:
+    """Return the body bytes behind the catalogs."""
+    sizes = [
+        source.payload_size
+        for source in _payload_sources(coordinators)
+        if source.payload_size is not None
+    ]
+    return sum(sizes) if sizes else None
+
+
+def _items_decoded(coordinators: list[StremioCatalogCoordinator]) -> int | None:
+    """Return the metas read to fill the catalogs."""
+    counts = [
+        source.items_decoded
+        for source in _payload_sources(coordinators)
+        if source.items_decoded is not None
+    ]
+    return sum(counts) if counts else None
+
+
+def _items_kept(coordinators: list[StremioCatalogCoordinator]) -> int | None:
+    """Return the items the catalogs hold."""
+    counts = [
+        len(coordinator.data)
+        for coordinator in coordinators
+        if coordinator.data is not None
+    ]
+    return sum(counts) if counts else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class StremioDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describe a diagnostic sensor summarizing the catalogs of an entry."""
+
+    value_fn: Callable[[list[StremioCatalogCoordinator]], float | int | None]
+
+
+DIAGNOSTIC_SENSORS = (
+    StremioDiagnosticSensorEntityDescription(
+        key="refresh_duration",
+        name="Duração da última atualização",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_refresh_duration,
+    ),
+    StremioDiagnosticSensorEntityDescription(
+        key="payload_size",
+        name="Tamanho dos catálogos",
+        icon="mdi:download-network",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.KIBIBYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_payload_size,
+    ),
+    StremioDiagnosticSensorEntityDescription(
+        key="items_decoded",
+        name="Itens decodificados",
+        icon="mdi:code-json",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_items_decoded,
+    ),
+    StremioDiagnosticSensorEntityDescription(
+        key="items_kept",
+        name="Itens mantidos",
+        icon="mdi:filter-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_items_kept,
+    ),
+    StremioDiagnosticSensorEntityDescription(
+        key="consecutive_failures",
+        name="Falhas consecutivas",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinators: max(
+            coordinator.consecutive_failures for coordinator in coordinators
+        ),
+    ),
+)
+
+
+@callback
+def _async_get_item_store(
+    hass: HomeAssistant,
+    media_type: str,
+    base_url: str,
+    images: StremioImageCache | None,
+) -> StremioItemStore:
+    """Return the item store shared by the sensors of a catalog source."""
+    stores = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ITEM_STORES, {})
+    # Add-ons describe the same title differently, and entries with and
+    # without the image proxy format images differently
+    key = (media_type, base_url, images is not None)
+
+    if (store := stores.get(key)) is None:
+        store = stores[key] = StremioItemStore(media_type, images)
+    return store
+
+
 async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
@@ -63,29 +231,74 @@ async def async_setup_platform(
     limit = config.get(CONF_LIMIT)
     media_type = config.get(CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE)
     genres = config.get(CONF_GENRES, [])
+    scan_interval = scan_interval_from_config(config.get(CONF_SCAN_INTERVAL))
+
+    hub = async_get_hub(hass)
+    await hub.async_setup()
+    owner = f"{DOMAIN}_{name}"
+    coordinators = {
+        genre: hub.async_subscribe(owner, media_type, genre, limit, scan_interval)
+        for genre in genres or [None]
+    }
 
+    item_store = _async_get_item_store(
+        hass, media_type, next(iter(coordinators.values())).base_url, None
+    )
     entities = []
 
     if not genres:
         # Create a default sensor with no genre filter
-        entities.append(StremioSensor(None, name, limit, media_type, None))
+        entities.append(
+            StremioSensor(
+                coordinators[None],
+                None,
+                name,
+                limit,
+                media_type,
+                None,
+                item_store=item_store,
+            )
+        )
     else:
         # Create a sensor for each genre
         for genre in genres:
             genre_name = f"{name} - {GENRE_TRANSLATIONS.get(genre, genre)}"
-            entities.append(StremioSensor(None, genre_name, limit, media_type, genre))
+            entities.append(
+                StremioSensor(
+                    coordinators[genre],
+                    None,
+                    genre_name,
+                    limit,
+                    media_type,
+                    genre,
+                    item_store=item_store,
+                )
+            )
 
-    async_add_entities(entities, True)
+    await hub.async_refresh(coordinators.values())
+    async_add_entities(entities)
 
 
 async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+    hass: HomeAssistant,
+    entry: StremioConfigEntry,
+    async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Stremio sensor from a config entry."""
     config = hass.data[DOMAIN][entry.entry_id]
+    coordinators = entry.runtime_data.coordinators
     limit = config.get(CONF_LIMIT)
     media_type = config.get(CONF_MEDIA_TYPE, DEFAULT_MEDIA_TYPE)
     genres = config.get(CONF_GENRES, [])
+    images = None
+    if config.get(CONF_IMAGE_PROXY):
+        images = await entry.runtime_data.hub.async_get_image_cache()
+    item_store = _async_get_item_store(
+        hass, media_type, next(iter(coordinators.values())).base_url, images
+    )
+    feeds = None
+    if config.get(CONF_LIGHTWEIGHT):
+        feeds = entry.runtime_data.hub.async_get_catalog_feeds()
 
     # Set standardized name based on media type
     media_type_name = MEDIA_TYPES.get(media_type, media_type.capitalize())
@@ -100,7 +313,16 @@ async def async_setup_entry(
             "Criando sensor Stremio padrão sem filtro de gênero: %s", sensor_name
         )
         entities.append(
-            StremioSensor(entry.entry_id, sensor_name, limit, media_type, None)
+            StremioSensor(
+                coordinators[None],
+                entry.entry_id,
+                sensor_name,
+                limit,
+                media_type,
+                images=images,
+                item_store=item_store,
+                feeds=feeds,
+            )
         )
     else:
         # Create a sensor for each selected genre
@@ -109,33 +331,231 @@ async def async_setup_entry(
             sensor_name = f"{base_name} - {genre_name_pt}"
             LOGGER.debug("Criando sensor Stremio para gênero: %s", genre_name_pt)
             entities.append(
-                StremioSensor(entry.entry_id, sensor_name, limit, media_type, genre)
+                StremioSensor(
+                    coordinators[genre],
+                    entry.entry_id,
+                    sensor_name,
+                    limit,
+                    media_type,
+                    genre,
+                    images=images,
+                    item_store=item_store,
+                    feeds=feeds,
+                )
             )
 
-    async_add_entities(entities, True)
+    # Refresh health and cost, on the same device
+    entities.extend(
+        StremioDiagnosticSensor(
+            list(coordinators.values()), entry.entry_id, media_type, description
+        )
+        for description in DIAGNOSTIC_SENSORS
+    )
+
+    async_add_entities(entities)
 
 
-class StremioSensor(SensorEntity):
-    """Representation of a Stremio sensor."""
+class StremioItemStore:
+    """
+    Card entries for upcoming-media-card, shared by the sensors of a catalog source.
 
-    _attr_icon = "mdi:play-circle"
-    _attr_has_entity_name = True  # Enable entity registry name handling
+    A title listed by several catalogs, such as the Action and Sci-Fi ones, is
+    formatted once and every sensor showing it references the same entry, so
+    memory grows with unique titles rather than with genres times limit.
+    Entries are keyed by title id, and each owner keeps the ordered ids it
+    shows; a title no owner references any more is dropped. An entry is
+    formatted again when its item changes, and every entry when the day
+    changes, since it carries the date of its batch.
+
+    With an image cache, posters and backgrounds point at its local proxy.
+    The images of a title stay registered while an owner references it, even
+    when its entry is formatted again.
+    """
 
     def __init__(
+        self, media_type: str, images: StremioImageCache | None = None
+    ) -> None:
+        """Initialize the store."""
+        self._media_type = media_type
+        self._images = images
+        # Card entries, with the items they were formatted from, by title id
+        self._entries: dict[str, tuple[StremioMeta, dict[str, Any]]] = {}
+        self._refs: dict[str, list[str]] = {}
+        self._ref_counts: Counter[str] = Counter()
+        # Image URLs registered with the image cache, by title id
+        self._image_urls: dict[str, set[str]] = {}
+        self._today: str | None = None
+        # Items formatted in the last batch, by rank
+        self.new_items: list[StremioMeta] = []
+
+    def __len__(self) -> int:
+        """Return the number of titles with a card entry."""
+        return len(self._entries)
+
+    def format(
+        self, owner: str, items: list[StremioMeta], today: str
+    ) -> list[dict[str, Any]]:
+        """Return the card entries of an owner's batch of items dated ``today``."""
+        if today != self._today:
+            self._entries = {}
+            self._today = today
+
+        card_items = []
+        ids = []
+        self.new_items = []
+
+        for item in items:
+            cached = self._entries.get(item.id)
+            if cached is not None and cached[0] == item:
+                entry = cached[1]
+            else:
+                try:
+                    entry = self._format_item_for_upcoming_media_card(item, today)
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.error("Erro formatando item %s: %s", item.name, err)
+                    continue
+                self._entries[item.id] = (item, entry)
+                self.new_items.append(item)
+            ids.append(item.id)
+            card_items.append(entry)
+
+        self._ref_counts.update(ids)
+        self._release(self._refs.get(owner, []))
+        self._refs[owner] = ids
+        return card_items
+
+    def release(self, owner: str) -> None:
+        """Drop the references of an owner."""
+        self._release(self._refs.pop(owner, []))
+
+    def _release(self, ids: list[str]) -> None:
+        """Drop references, and the entries no owner references any more."""
+        self._ref_counts.subtract(ids)
+        for meta_id in ids:
+            if self._ref_counts[meta_id] <= 0:
+                del self._ref_counts[meta_id]
+                self._entries.pop(meta_id, None)
+                if self._images is not None:
+                    for url in self._image_urls.pop(meta_id, ()):
+                        self._images.async_unregister(url)
+
+    def _image_url(
+        self, images: StremioImageCache, item: StremioMeta, url: str, kind: str
+    ) -> str:
+        """Return the proxy URL of an image, registering it once per title."""
+        urls = self._image_urls.setdefault(item.id, set())
+        if url in urls:
+            return images.proxy_url(url, kind)
+        urls.add(url)
+        return images.async_register(url, kind)
+
+    def _format_item_for_upcoming_media_card(
+        self, item: StremioMeta, today: str
+    ) -> dict[str, Any]:
+        """Format item data for upcoming-media-card."""
+        # Extract the year from the ID (format: tt123456:year)
+        item_id_parts = item.id.split(":")
+        year = item_id_parts[1] if len(item_id_parts) > 1 else None
+
+        # Poster and backdrop URLs are normalized to https when parsed
+        poster = item.poster
+        backdrop = item.background
+        if self._images is not None:
+            if poster:
+                poster = self._image_url(self._images, item, poster, "poster")
+            if backdrop:
+                backdrop = self._image_url(self._images, item, backdrop, "fanart")
+
+        directors = item.director or ("Desconhecido",)
+
+        # Basic item info
+        result = {
+            "airdate": today,
+            "aired": today,
+            "release": today,
+            "poster": poster,
+            "fanart": backdrop,
+            "title": item.name,
+            "runtime": item.runtime if item.runtime is not None else 0,
+            "rating": item.imdb_rating if item.imdb_rating is not None else 0,
+            "year": year,
+            "studio": ", ".join(directors),
+            "genres": ", ".join([GENRE_TRANSLATIONS.get(g, g) for g in item.genre]),
+            "plot": item.description,
+        }
+
+        # Add TV series specific data
+        if self._media_type == "series":
+            result.update(
+                {
+                    "episode": item.episode_count
+                    if item.episode_count is not None
+                    else 1,
+                    "seasons": item.season_count
+                    if item.season_count is not None
+                    else 1,
+                    "status": STATUS_TRANSLATIONS.get(item.status, item.status)
+                    if item.status is not None
+                    else "Finalizada",
+                }
+            )
+
+        else:
+            # For movies
+            result.update(
+                {
+                    "in_cinemas": year,
+                    "release_date": year,
+                }
+            )
+
+        return result
+
+
+class StremioSensor(StremioEntity, RestoreEntity, SensorEntity):
+    """
+    Representation of a Stremio sensor.
+
+    Until its catalog is loaded, which during startup waits until Home
+    Assistant has started, the sensor shows the state it had before.
+
+    By default the card entries are in the ``data`` attribute. With catalog
+    feeds, the sensor is lightweight: its attributes only carry the count and
+    a version of the entries, which are served by the catalog API instead of
+    being sent with every state change.
+    """
+
+    _attr_icon = "mdi:play-circle"
+    # The card list is too large to keep in the history of every update
+    _unrecorded_attributes = frozenset({"data"})
+
+    def __init__(  # noqa: PLR0913
         self,
+        coordinator: StremioCatalogCoordinator,
         entry_id: str | None,
         name: str,
         limit: int,
         media_type: str,
         genre: str | None = None,
+        *,
+        images: StremioImageCache | None = None,
+        item_store: StremioItemStore | None = None,
+        feeds: StremioCatalogFeeds | None = None,
     ) -> None:
         """Initialize the sensor."""
-        self._entry_id = entry_id
+        super().__init__(coordinator, entry_id, media_type)
         self._limit = limit
-        self._media_type = media_type
         self._genre = genre
+        self._images = images
+        if item_store is None:
+            item_store = StremioItemStore(media_type, images)
+        self._item_store = item_store
+        self._feeds = feeds
         self._state = None
         self._attributes = {}
+        # Hash of the items and date behind the current state
+        self._fingerprint: int | None = None
+        self._written_available: bool | None = None
 
         # Set appropriate icon based on media type
         self._attr_icon = "mdi:movie" if media_type == "movie" else "mdi:television"
@@ -165,176 +585,162 @@ class StremioSensor(SensorEntity):
         return self._attributes
 
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this Stremio instance."""
-        if not self._entry_id:
-            return None
-
-        # Set standard device name based on media type
-        media_type_name = MEDIA_TYPES.get(
-            self._media_type, self._media_type.capitalize()
+    def available(self) -> bool:
+        """Keep serving the last catalog when a refresh fails."""
+        return super().available or self.coordinator.data is not None
+
+    async def async_added_to_hass(self) -> None:
+        """Populate the sensor from an already loaded catalog, or its last state."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_refresh_listener(self._handle_refresh)
         )
-        device_name = f"Stremio {media_type_name}"
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._entry_id}_{self._media_type}")},
-            name=device_name,
-            manufacturer="Stremio",
-            model="Integration",
+        # Card entries carry the date, which changes whether the catalog does
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._handle_midnight, hour=0, minute=0, second=0
+            )
         )
+        if self.coordinator.data is not None:
+            self._update_from_coordinator()
+        elif (
+            last_state := await self.async_get_last_state()
+        ) is not None and last_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            # Lightweight sensors do not carry their entries, even from before
+            restored = RESTORED_ATTRIBUTES
+            if self._feeds is not None:
+                restored -= {"data"}
+            self._state = last_state.state
+            self._attributes = {
+                key: value
+                for key, value in last_state.attributes.items()
+                if key in restored
+            }
 
-    async def async_update(self) -> None:
-        """Update the sensor."""
-        try:
-            async with async_timeout.timeout(10):
-                items = await self._fetch_stremio_items()
-
-            if not items:
-                _LOGGER.error("Nenhum item encontrado")
-                return
-
-            # Limit the number of items
-            items = items[: self._limit]
-
-            # Format the items for upcoming-media-card
-            card_items = []
-            for item in items:
-                try:
-                    formatted_item = self._format_item_for_upcoming_media_card(item)
-                    card_items.append(formatted_item)
-                except Exception as err:  # pylint: disable=broad-except
-                    _LOGGER.error("Erro formatando item %s: %s", item.get("name"), err)
+    async def async_will_remove_from_hass(self) -> None:
+        """Release the shared card entries of the sensor."""
+        await super().async_will_remove_from_hass()
+        self._item_store.release(self.unique_id)
+        if self._feeds is not None:
+            self._feeds.async_remove(self.entity_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        changed = self._update_from_coordinator()
+
+        # Skip the state write, and its recorder row, for an unchanged catalog
+        if changed or self.available != self._written_available:
+            self._written_available = self.available
+            super()._handle_coordinator_update()
+
+    @callback
+    def _handle_refresh(self) -> None:
+        """Follow the age of a kept catalog, which coordinator updates do not."""
+        if self.coordinator.data is not None and (
+            self.coordinator.staleness is not None or "staleness" in self._attributes
+        ):
+            self._handle_coordinator_update()
+
+    @callback
+    def _handle_midnight(self, _now: datetime) -> None:
+        """Date the card entries of the catalog with the new day."""
+        if self.coordinator.data is not None:
+            self._handle_coordinator_update()
+
+    @callback
+    def _update_from_coordinator(self) -> bool:
+        """Build the sensor state from the shared catalog, if it changed."""
+        items = self.coordinator.data
+
+        if not items:
+            _LOGGER.error("Nenhum item encontrado")
+            return False
+
+        # Limit the number of items
+        items = items[: self._limit]
+
+        today = dt_util.now().strftime("%Y-%m-%d")
+        # Seconds since the catalog was fetched, while a refresh is failing
+        staleness = self.coordinator.staleness
+        if staleness is not None:
+            staleness = round(staleness)
+        fingerprint = hash((today, staleness, *items))
+        if fingerprint == self._fingerprint:
+            return False
+        self._fingerprint = fingerprint
+
+        # Format the items for upcoming-media-card
+        start = time.perf_counter()
+        card_items = self._item_store.format(self.unique_id, items, today)
+        self.coordinator.format_durations.record(time.perf_counter() - start)
+
+        # Warm the image cache before a dashboard asks for the new titles
+        if self._images is not None and self._item_store.new_items:
+            self._images.async_prefetch(
+                self.unique_id,
+                [
+                    (kind, url)
+                    for item in self._item_store.new_items[:IMAGE_PREFETCH_LIMIT]
+                    for kind, url in (
+                        ("poster", item.poster),
+                        ("fanart", item.background),
+                    )
+                    if url
+                ],
+            )
 
-            self._state = len(card_items)
+        self._state = len(card_items)
 
+        if self._feeds is None:
             # Set up attributes in the exact structure upcoming-media-card expects
             self._attributes = {
                 "data": card_items,
                 "media_type": self._media_type,
                 "count": len(card_items),
             }
+        else:
+            feed = self._feeds.async_update(self.entity_id, card_items)
+            self._attributes = {
+                "media_type": self._media_type,
+                "count": len(card_items),
+                "version": feed.version,
+                "catalog_url": CATALOG_FEED_URL.format(entity_id=self.entity_id),
+            }
 
-            # Add genre information to attributes if we're filtering
-            if self._genre:
-                self._attributes["genre"] = self._genre
-                self._attributes["genre_name"] = GENRE_TRANSLATIONS.get(
-                    self._genre, self._genre
-                )
-
-            # Log successful update
-            media_type_name = MEDIA_TYPES.get(self._media_type, self._media_type)
-            genre_info = (
-                f" no gênero {GENRE_TRANSLATIONS.get(self._genre, self._genre)}"
-                if self._genre
-                else ""
-            )
+        if staleness is not None:
+            self._attributes["staleness"] = staleness
 
-            _LOGGER.debug(
-                "Atualização do Stremio concluída, encontrados %s %s%s",
-                self._state,
-                media_type_name.lower(),
-                genre_info,
+        # Add genre information to attributes if we're filtering
+        if self._genre:
+            self._attributes["genre"] = self._genre
+            self._attributes["genre_name"] = GENRE_TRANSLATIONS.get(
+                self._genre, self._genre
             )
 
-        except TimeoutError:
-            _LOGGER.error("Tempo esgotado ao buscar dados do Stremio")
-        except Exception as err:  # pylint: disable=broad-except
-            _LOGGER.error("Erro ao atualizar sensor do Stremio: %s", err)
-
-    async def _fetch_stremio_items(self) -> list[dict[str, Any]]:
-        """Fetch items from Stremio API."""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-            "DNT": "1",
-            "Referer": "https://web.stremio.com/",
-        }
-
-        # Build the API URL based on whether we have a genre filter
-        base_url = STREMIO_API_BASE_URL.get(
-            self._media_type, STREMIO_API_BASE_URL["movie"]
+        # Log successful update
+        media_type_name = MEDIA_TYPES.get(self._media_type, self._media_type)
+        genre_info = (
+            f" no gênero {GENRE_TRANSLATIONS.get(self._genre, self._genre)}"
+            if self._genre
+            else ""
         )
 
-        if self._genre:
-            api_url = f"{base_url}/genre={self._genre}.json"
-        else:
-            api_url = f"{base_url}.json"
-
-        _LOGGER.debug("Buscando dados do Stremio da URL: %s", api_url)
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_url, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-
-                if not data.get("metas"):
-                    _LOGGER.error("Resposta inválida da API do Stremio: %s", data)
-                    return []
-
-                return data.get("metas", [])
-
-    def _format_item_for_upcoming_media_card(
-        self, item: dict[str, Any]
-    ) -> dict[str, Any]:
-        """Format item data for upcoming-media-card."""
-        poster = item.get("poster", "")
-        # Extract the year from the ID (format: tt123456:year)
-        item_id_parts = item.get("id", "").split(":")
-        year = item_id_parts[1] if len(item_id_parts) > 1 else None
-
-        # Default values for required fields
-        now = dt_util.now()
-
-        # Format the poster URLs
-        if poster and not poster.startswith(("http:", "https:")):
-            poster = f"https:{poster}"
-
-        backdrop = item.get("background", "")
-        if backdrop and not backdrop.startswith(("http:", "https:")):
-            backdrop = f"https:{backdrop}"
+        _LOGGER.debug(
+            "Atualização do Stremio concluída, encontrados %s %s%s",
+            self._state,
+            media_type_name.lower(),
+            genre_info,
+        )
+        return True
 
-        # Handle director field - ensure it's a list before joining
-        directors = item.get("director", ["Desconhecido"])
-        if not isinstance(directors, list):
-            directors = [str(directors)] if directors else ["Desconhecido"]
 
-        # Handle genre field - ensure it's a list before joining
-        genres = item.get("genre", [])
-        if not isinstance(genres, list):
-            genres = [str(genres)] if genres else []
+class StremioDiagnosticSensor(StremioEntryEntity, SensorEntity):
+    """A measure of the refreshes of every catalog of an entry."""
 
-        # Basic item info
-        result = {
-            "airdate": now.strftime("%Y-%m-%d"),
-            "aired": now.strftime("%Y-%m-%d"),
-            "release": now.strftime("%Y-%m-%d"),
-            "poster": poster,
-            "fanart": backdrop,
-            "title": item.get("name", "Desconhecido"),
-            "runtime": item.get("runtime", 0),
-            "rating": item.get("imdbRating", 0),
-            "year": year,
-            "studio": ", ".join(directors),
-            "genres": ", ".join([GENRE_TRANSLATIONS.get(g, g) for g in genres]),
-            "plot": item.get("description", ""),
-        }
+    entity_description: StremioDiagnosticSensorEntityDescription
 
-        # Add TV series specific data
-        if self._media_type == "series":
-            result.update(
-                {
-                    "episode": item.get("episodeCount", 1),
-                    "seasons": item.get("seasonCount", 1),
-                    "status": item.get("status", "Finalizada"),
-                }
-            )
-
-        else:
-            # For movies
-            result.update(
-                {
-                    "in_cinemas": year,
-                    "release_date": year,
-                }
-            )
-
-        return result
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the value of the measure."""
+        return self.entity_description.value_fn(self.coordinators)
@@ -0,0 +1,344 @@
+"""Persistent catalogs, add-on manifests and title details for Stremio."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import (
+    StremioApiClientCommunicationError,
+    StremioApiClientError,
+    addon_serves,
+)
+from .const import (
+    LOGGER,
+    MANIFEST_STORAGE_KEY,
+    MANIFEST_TTL,
+    META_CACHE_MAX,
+    META_FETCH_WORKERS,
+    META_STORAGE_KEY,
+    META_TTL,
+    SNAPSHOT_FIELDS,
+    SNAPSHOT_FORMAT,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .data import StremioMeta
+
+if TYPE_CHECKING:
+    from .api import StremioApiClient, StremioManifest
+
+
+def _compact(items: list[StremioMeta]) -> list[list[Any]]:
+    """Project catalog items onto the snapshot fields, one row per item."""
+    rows = []
+    for item in items:
+        meta = item.to_meta()
+        rows.append([meta.get(field) for field in SNAPSHOT_FIELDS])
+    return rows
+
+
+def _expand(rows: list[list[Any]]) -> list[StremioMeta]:
+    """Rebuild catalog items from snapshot rows."""
+    items = []
+    for row in rows:
+        meta = StremioMeta.from_meta(
+            {
+                field: value
+                for field, value in zip(SNAPSHOT_FIELDS, row, strict=True)
+                if value is not None
+            }
+        )
+        if meta is not None:
+            items.append(meta)
+    return items
+
+
+def _details(meta: dict[str, Any]) -> dict[str, Any]:
+    """Return the episode and season counts and status of a full meta."""
+    # Season 0 holds the specials
+    episodes = [
+        video
+        for video in meta.get("videos") or []
+        if isinstance(video, dict)
+        and isinstance(video.get("season"), int)
+        and video["season"] > 0
+    ]
+    details = {
+        "episode_count": meta.get("episodeCount") or len(episodes),
+        "season_count": meta.get("seasonCount")
+        or len({video["season"] for video in episodes}),
+        "status": meta.get("status"),
+    }
+    return {field: value for field, value in details.items() if value}
+
+
+@dataclass
+class StremioMetaStats:
+    """Lookups of title details, for diagnostics."""
+
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+
+class StremioCatalogStore:
+    """
+    Keep the last good catalogs on disk.
+
+    Only the fields the sensors read are stored, as positional rows, so the
+    snapshot stays small. Items are written when a catalog changes, and the
+    time of every successful fetch is recorded, so a catalog restored from the
+    snapshot is as old as its last fetch. Snapshots written with another
+    format or field list are discarded on load, and catalogs nobody has
+    fetched for ``SNAPSHOT_MAX_AGE`` are pruned on save.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, STORAGE_KEY)
+        self._catalogs: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the snapshot from disk."""
+        data = await self._store.async_load()
+
+        if not data:
+            return
+
+        if data.get("format") != SNAPSHOT_FORMAT or data.get("fields") != list(
+            SNAPSHOT_FIELDS
+        ):
+            LOGGER.debug("Descartando snapshot de catálogos do Stremio desatualizado")
+            return
+
+        self._catalogs = data.get("catalogs", {})
+
+    @callback
+    def async_get(self, url: str) -> tuple[list[StremioMeta], float] | None:
+        """Return the stored items of a catalog and when they were last fetched."""
+        if (catalog := self._catalogs.get(url)) is None:
+            return None
+        return _expand(catalog["items"]), catalog["updated"]
+
+    @callback
+    def async_update(self, url: str, items: list[StremioMeta], fetched: float) -> None:
+        """Record a catalog and schedule a save."""
+        self._catalogs[url] = {"updated": fetched, "items": _compact(items)}
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_touch(self, url: str, fetched: float) -> None:
+        """Record that a stored catalog was fetched again and schedule a save."""
+        if (catalog := self._catalogs.get(url)) is not None:
+            catalog["updated"] = fetched
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot to write, without long forgotten catalogs."""
+        oldest = time.time() - SNAPSHOT_MAX_AGE.total_seconds()
+        self._catalogs = {
+            url: catalog
+            for url, catalog in self._catalogs.items()
+            if catalog["updated"] >= oldest
+        }
+
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "fields": list(SNAPSHOT_FIELDS),
+            "catalogs": self._catalogs,
+        }
+
+
+class StremioManifestStore:
+    """
+    Keep the manifests of Stremio add-ons on disk.
+
+    A manifest fetched less than ``MANIFEST_TTL`` ago is returned without a
+    request. An older one is fetched again, and still returned while the
+    add-on cannot be reached.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: StremioApiClient) -> None:
+        """Initialize the store."""
+        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, MANIFEST_STORAGE_KEY)
+        self._client = client
+        self._manifests: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the manifests from disk."""
+        if data := await self._store.async_load():
+            self._manifests = data.get("manifests", {})
+
+    async def async_get(self, url: str) -> StremioManifest:
+        """Return the manifest of an add-on, fetching it once it is too old."""
+        cached = self._manifests.get(url)
+        if (
+            cached is not None
+            and time.time() - cached["fetched"] < MANIFEST_TTL.total_seconds()
+        ):
+            return cached["manifest"]
+
+        try:
+            manifest = await self._client.async_get_manifest(url)
+        except StremioApiClientError as err:
+            if cached is None:
+                raise
+            LOGGER.warning(
+                "Usando manifesto em cache do add-on do Stremio %s: %s", url, err
+            )
+            return cached["manifest"]
+
+        self._manifests[url] = {"fetched": time.time(), "manifest": manifest}
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+        return manifest
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the manifests to write."""
+        return {"manifests": self._manifests}
+
+
+class StremioMetaStore:
+    """
+    Keep the details of titles, fetched from add-on meta endpoints, on disk.
+
+    Catalog metas rarely carry episode and season counts or a status, which
+    only the meta of a single title has. Details fetched less than
+    ``META_TTL`` ago are used without a request, so a warm cache sends
+    requests only for titles new to a catalog. Titles the add-on refused, such
+    as unknown ids, are remembered for as long, with no details, and add-ons
+    whose manifest lists no meta resource for the media type are not asked at
+    all. Misses are fetched up to ``META_FETCH_WORKERS`` at once, and the
+    ``META_CACHE_MAX`` most recently used titles are kept.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: StremioApiClient,
+        manifests: StremioManifestStore,
+    ) -> None:
+        """Initialize the store."""
+        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, META_STORAGE_KEY)
+        self._client = client
+        self._manifests = manifests
+        self._details: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._semaphore = asyncio.Semaphore(META_FETCH_WORKERS)
+        self.stats = StremioMetaStats()
+
+    def __len__(self) -> int:
+        """Return the number of titles with details."""
+        return len(self._details)
+
+    async def async_load(self) -> None:
+        """Load the details from disk, least recently used first."""
+        if data := await self._store.async_load():
+            self._details = OrderedDict(data.get("metas", {}))
+
+    async def async_enrich(
+        self, base_url: str, media_type: str, items: list[StremioMeta]
+    ) -> list[StremioMeta]:
+        """Return the items with the details of each title filled in."""
+        if not await self._async_serves_metas(base_url, media_type):
+            return items
+
+        now = time.time()
+        found: dict[str, dict[str, Any]] = {}
+        misses = []
+
+        for item in items:
+            key = f"{media_type}/{item.id}"
+            if (cached := self._details.get(key)) is None:
+                misses.append(item.id)
+                continue
+            self._details.move_to_end(key)
+            found[item.id] = cached["details"]
+            if now - cached["fetched"] >= META_TTL.total_seconds():
+                misses.append(item.id)
+
+        self.stats.hits += len(items) - len(misses)
+        self.stats.misses += len(misses)
+
+        if misses:
+            fetched = await asyncio.gather(
+                *(
+                    self._async_fetch(base_url, media_type, meta_id)
+                    for meta_id in dict.fromkeys(misses)
+                )
+            )
+            # Expired details stay in use while a title cannot be fetched
+            found.update(
+                {
+                    meta_id: details
+                    for meta_id, details in fetched
+                    if details is not None
+                }
+            )
+
+            while len(self._details) > META_CACHE_MAX:
+                self._details.popitem(last=False)
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+        return [
+            replace(item, **found[item.id]) if found.get(item.id) else item
+            for item in items
+        ]
+
+    async def _async_serves_metas(self, base_url: str, media_type: str) -> bool:
+        """Return True if the add-on lists a meta resource for the media type."""
+        try:
+            manifest = await self._manifests.async_get(f"{base_url}/manifest.json")
+        except StremioApiClientError as err:
+            LOGGER.debug(
+                "Erro obtendo manifesto do add-on do Stremio %s: %s", base_url, err
+            )
+            return False
+
+        return addon_serves(manifest, "meta", media_type)
+
+    async def _async_fetch(
+        self, base_url: str, media_type: str, meta_id: str
+    ) -> tuple[str, dict[str, Any] | None]:
+        """Fetch and record the details of a title."""
+        key = f"{media_type}/{meta_id}"
+
+        async with self._semaphore:
+            try:
+                meta = await self._client.async_get_meta(base_url, media_type, meta_id)
+            except StremioApiClientCommunicationError as err:
+                self.stats.errors += 1
+                LOGGER.debug(
+                    "Erro obtendo detalhes do título %s do Stremio: %s", meta_id, err
+                )
+                return meta_id, None
+            except StremioApiClientError as err:
+                # Refused for good, such as an unknown id; ask again after the TTL
+                self.stats.errors += 1
+                LOGGER.debug(
+                    "Título %s recusado pelo add-on do Stremio: %s", meta_id, err
+                )
+                cached = self._details.get(key)
+                self._details[key] = {
+                    "fetched": time.time(),
+                    "details": {} if cached is None else cached["details"],
+                }
+                return meta_id, None
+
+        details = _details(meta)
+        self._details[key] = {"fetched": time.time(), "details": details}
+        return meta_id, details
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the details to write."""
+        return {"metas": self._details}